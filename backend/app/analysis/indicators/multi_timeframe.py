@@ -7,6 +7,11 @@ import pandas as pd
 import numpy as np
 from dataclasses import dataclass
 
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None  # type: ignore[assignment]
+
 
 @dataclass
 class TimeframeSignal:
@@ -56,9 +61,17 @@ def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
     return resampled
 
 
+def _rolling_mean(series: pd.Series, period: int) -> pd.Series:
+    """Full-window rolling mean, using bottleneck's C kernel when available."""
+    if bn is not None and 0 < period <= len(series):
+        values = bn.move_mean(series.to_numpy(dtype=float), window=period, min_count=period)
+        return pd.Series(values, index=series.index, name=series.name)
+    return series.rolling(window=period, min_periods=period).mean()
+
+
 def compute_sma(series: pd.Series, period: int) -> pd.Series:
     """Simple Moving Average."""
-    return series.rolling(window=period, min_periods=period).mean()
+    return _rolling_mean(series, period)
 
 
 def compute_rsi(series: pd.Series, period: int = 14) -> pd.Series:
@@ -67,8 +80,8 @@ def compute_rsi(series: pd.Series, period: int = 14) -> pd.Series:
     gain = delta.where(delta > 0, 0.0)
     loss = (-delta).where(delta < 0, 0.0)
 
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
+    avg_gain = _rolling_mean(gain, period)
+    avg_loss = _rolling_mean(loss, period)
 
     # When avg_loss is 0, RSI is 100 (all gains, no losses)
     rsi = pd.Series(np.nan, index=series.index)
@@ -1,9 +1,11 @@
 """Portfolio aggregation: cross-strategy exposure, concentration (HHI), conflict detection."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class StrategyExposure:
     strategy_id: str
     strategy_name: str
@@ -13,7 +15,7 @@ class StrategyExposure:
     side: str  # "long" or "short"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AggregationResult:
     total_exposure: float
     net_exposure: float
@@ -48,9 +50,9 @@ class PortfolioAggregator:
                 hhi=0, conflicts=[], warnings=[],
             )
 
-        # Aggregate by stock and strategy
-        stock_long: dict[str, float] = {}
-        stock_short: dict[str, float] = {}
+        # Aggregate by stock and strategy in one pass. Per stock, in first-seen
+        # order: [long value, short value, long strategy_ids, short strategy_ids]
+        stocks: dict[str, list] = {}
         strategy_totals: dict[str, float] = {}
 
         for pos in positions:
@@ -59,27 +61,26 @@ class PortfolioAggregator:
 
             strategy_totals[sid] = strategy_totals.get(sid, 0) + val
 
-            if pos.side == "long":
-                stock_long[pos.stock_code] = stock_long.get(pos.stock_code, 0) + val
-            else:
-                stock_short[pos.stock_code] = stock_short.get(pos.stock_code, 0) + val
+            entry = stocks.get(pos.stock_code)
+            if entry is None:
+                stocks[pos.stock_code] = entry = [0, 0, [], []]
+            side = pos.side != "long"  # 0 = long, 1 = short
+            entry[side] += val
+            entry[side + 2].append(sid)
 
-        long_exposure = sum(stock_long.values())
-        short_exposure = sum(stock_short.values())
+        long_exposure = sum(entry[0] for entry in stocks.values())
+        short_exposure = sum(entry[1] for entry in stocks.values())
         total_exposure = long_exposure + short_exposure
         net_exposure = long_exposure - short_exposure
 
         # Net exposure per stock
-        all_stocks = set(stock_long) | set(stock_short)
-        stock_exposures = {
-            s: stock_long.get(s, 0) - stock_short.get(s, 0) for s in all_stocks
-        }
+        stock_exposures = {stock: entry[0] - entry[1] for stock, entry in stocks.items()}
 
         # HHI — concentration index based on stock weights
         hhi = _calculate_hhi(stock_exposures, total_exposure)
 
         # Conflict detection — same stock with opposing positions across strategies
-        conflicts = _detect_conflicts(positions)
+        conflicts = _detect_conflicts(stocks)
 
         # Warnings
         warnings = []
@@ -117,28 +118,20 @@ def _calculate_hhi(stock_exposures: dict[str, float], total_exposure: float) ->
     """
     if total_exposure <= 0:
         return 0.0
-    return sum(
-        ((abs(val) / total_exposure) * 100) ** 2
-        for val in stock_exposures.values()
-    )
+    values = np.fromiter(stock_exposures.values(), dtype=np.float64, count=len(stock_exposures))
+    # Divide (not multiply by the reciprocal) so a single position is exactly 10000
+    shares = np.abs(values) / total_exposure * 100
+    return float(np.square(shares).sum())
 
 
-def _detect_conflicts(positions: list[StrategyExposure]) -> list[dict]:
+def _detect_conflicts(stocks: dict[str, list]) -> list[dict]:
     """Find stocks where different strategies have opposing positions."""
-    stock_sides: dict[str, dict[str, list[str]]] = {}  # stock → side → [strategy_ids]
-
-    for pos in positions:
-        if pos.stock_code not in stock_sides:
-            stock_sides[pos.stock_code] = {"long": [], "short": []}
-        stock_sides[pos.stock_code][pos.side].append(pos.strategy_id)
-
-    conflicts = []
-    for stock, sides in stock_sides.items():
-        if sides["long"] and sides["short"]:
-            conflicts.append({
-                "stock_code": stock,
-                "long_strategies": sides["long"],
-                "short_strategies": sides["short"],
-            })
-
-    return conflicts
+    return [
+        {
+            "stock_code": stock,
+            "long_strategies": longs,
+            "short_strategies": shorts,
+        }
+        for stock, (_, _, longs, shorts) in stocks.items()
+        if longs and shorts
+    ]
@@ -73,42 +73,37 @@ def _group_attribution(
     total_pnl: float,
 ) -> list[AttributionEntry]:
     """Group trades by a key field and compute attribution metrics."""
-    groups: dict[str, dict] = {}
+    # key → [name, pnl, trade_count, win_count, loss_count]; plain lists keep
+    # the per-trade update to a few index ops
+    groups: dict[str, list] = {}
 
     for t in trades:
         key = t.get(key_field, "unknown")
-        name = t.get(name_field, key)
         pnl = t.get("pnl", 0)
 
-        if key not in groups:
-            groups[key] = {
-                "name": name,
-                "pnl": 0,
-                "trade_count": 0,
-                "win_count": 0,
-                "loss_count": 0,
-            }
-
-        g = groups[key]
-        g["pnl"] += pnl
-        g["trade_count"] += 1
+        g = groups.get(key)
+        if g is None:
+            groups[key] = g = [t.get(name_field, key), 0, 0, 0, 0]
+
+        g[1] += pnl
+        g[2] += 1
         if pnl > 0:
-            g["win_count"] += 1
+            g[3] += 1
         elif pnl < 0:
-            g["loss_count"] += 1
+            g[4] += 1
 
     entries = []
-    for key, g in groups.items():
-        pnl_pct = (g["pnl"] / total_pnl * 100) if total_pnl != 0 else 0
-        avg_pnl = g["pnl"] / g["trade_count"] if g["trade_count"] > 0 else 0
+    for key, (name, pnl, trade_count, win_count, loss_count) in groups.items():
+        pnl_pct = (pnl / total_pnl * 100) if total_pnl != 0 else 0
+        avg_pnl = pnl / trade_count
         entries.append(AttributionEntry(
             key=key,
-            name=g["name"],
-            pnl=round(g["pnl"], 2),
+            name=name,
+            pnl=round(pnl, 2),
             pnl_pct=round(pnl_pct, 2),
-            trade_count=g["trade_count"],
-            win_count=g["win_count"],
-            loss_count=g["loss_count"],
+            trade_count=trade_count,
+            win_count=win_count,
+            loss_count=loss_count,
             avg_pnl_per_trade=round(avg_pnl, 2),
         ))
 
@@ -1,6 +1,8 @@
 """Strategy correlation analysis: return correlation matrix and diversification ratio."""
 
 from dataclasses import dataclass
+from typing import Any
+
 import numpy as np
 
 
@@ -20,13 +22,14 @@ class StrategyCorrelation:
 
     @staticmethod
     def compute(
-        strategy_returns: dict[str, dict[str, list[float]]],
+        strategy_returns: dict[str, dict[str, Any]],
     ) -> CorrelationResult:
         """Calculate correlation matrix from strategy daily returns.
 
         Args:
-            strategy_returns: {strategy_id: {"name": str, "returns": [float]}}
-                Each strategy must have same-length daily return arrays.
+            strategy_returns: {strategy_id: {"name": str, "returns": [float] | ndarray}}
+                Each strategy must have same-length daily return arrays. NumPy
+                arrays are copied straight into the return matrix.
 
         Returns:
             CorrelationResult with correlation matrix and diversification metrics.
@@ -49,39 +52,39 @@ class StrategyCorrelation:
         # Build return matrix (n_strategies x n_days)
         returns_matrix = np.array([
             strategy_returns[sid]["returns"] for sid in ids
-        ], dtype=float)
-
-        # Compute correlation matrix
-        corr = np.corrcoef(returns_matrix)
+        ], dtype=np.float64)
+
+        # One covariance pass feeds the correlations, the per-strategy vols and
+        # the portfolio variance below. Correlation is normalized the same way
+        # np.corrcoef does it (two divisions, then clip)
+        cov = np.cov(returns_matrix)
+        vols = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / vols[:, None]
+            corr /= vols[None, :]
+        np.clip(corr, -1, 1, out=corr)
 
         # Handle NaN (e.g., zero-variance strategy)
         corr = np.nan_to_num(corr, nan=0.0)
 
-        # Find max/min correlation pairs (off-diagonal)
-        max_corr, min_corr = -2.0, 2.0
-        max_pair, min_pair = None, None
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                c = float(corr[i, j])
-                if c > max_corr:
-                    max_corr = c
-                    max_pair = (ids[i], ids[j], round(c, 4))
-                if c < min_corr:
-                    min_corr = c
-                    min_pair = (ids[i], ids[j], round(c, 4))
+        # Off-diagonal pairs (i < j) in row-major order; argmax/argmin return the
+        # first extreme, matching a strict-comparison scan over the pairs
+        rows, cols = np.triu_indices(n, k=1)
+        off_diag = corr[rows, cols]
+        hi, lo = int(np.argmax(off_diag)), int(np.argmin(off_diag))
+        max_pair = (ids[rows[hi]], ids[cols[hi]], round(float(off_diag[hi]), 4))
+        min_pair = (ids[rows[lo]], ids[cols[lo]], round(float(off_diag[lo]), 4))
 
         # Average off-diagonal correlation
-        off_diag = [float(corr[i, j]) for i in range(n) for j in range(i + 1, n)]
-        avg_correlation = float(np.mean(off_diag)) if off_diag else 0.0
+        avg_correlation = float(off_diag.mean())
 
         # Diversification ratio = weighted_avg_vol / portfolio_vol
-        # Using equal weights for simplicity
-        vols = np.std(returns_matrix, axis=1)
+        # Using equal weights for simplicity; portfolio variance is w' Σ w. The
+        # ddof of the covariance cancels in the ratio
         weights = np.ones(n) / n
-        weighted_avg_vol = float(np.dot(weights, vols))
-        portfolio_returns = np.dot(weights, returns_matrix)
-        portfolio_vol = float(np.std(portfolio_returns))
+        weighted_avg_vol = float(weights @ vols)
+        portfolio_var = float(weights @ cov @ weights)
+        portfolio_vol = float(np.sqrt(portfolio_var)) if portfolio_var > 0 else 0.0
         diversification_ratio = weighted_avg_vol / portfolio_vol if portfolio_vol > 0 else 1.0
 
         return CorrelationResult(
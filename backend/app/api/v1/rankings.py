@@ -1,6 +1,8 @@
 """Rankings API endpoints for real-time market rankings and interest stocks."""
 
+import asyncio
 import logging
+import time
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
@@ -42,6 +44,17 @@ class TrendingEntry(BaseModel):
     change_pct: float
 
 
+class RankingType(BaseModel):
+    type: str
+    label: str
+    description: str
+
+
+class RankingsCatalog(BaseModel):
+    rankings: list[RankingType]
+    theme_count: int
+
+
 class InterestStock(BaseModel):
     stock_code: str
     stock_name: str
@@ -109,22 +122,67 @@ async def get_theme_list(
         return [ThemeInfo(name=t, stock_count=0, stocks=[]) for t in list_all_themes()]
 
 
+# Interest-stock results: (user_id, limit) → (computed_at, results). KIS
+# rankings only move every few seconds, so request bursts reuse the last result
+_interest_cache: dict[tuple, tuple[float, list[InterestStock]]] = {}
+_INTEREST_TTL = 5.0  # seconds
+_INTEREST_CACHE_MAX_SIZE = 256  # max entries; oldest are dropped first
+
+
+def clear_interest_cache():
+    """Drop all cached interest-stock results."""
+    _interest_cache.clear()
+
+
+def _cache_interest_stocks(key: tuple, stocks: list[InterestStock]) -> None:
+    """Store a result, evicting expired entries and then the oldest past the bound."""
+    now = time.monotonic()
+    for k in [k for k, (ts, _) in _interest_cache.items() if now - ts >= _INTEREST_TTL]:
+        del _interest_cache[k]
+    _interest_cache.pop(key, None)  # re-insert as the newest entry
+    while len(_interest_cache) >= _INTEREST_CACHE_MAX_SIZE:
+        del _interest_cache[next(iter(_interest_cache))]
+    _interest_cache[key] = (now, stocks)
+
+
 @router.get("/interest", response_model=list[InterestStock])
 async def get_interest_stocks(
-    limit: int = Query(default=20, le=50),
+    limit: int = Query(default=20, ge=1, le=50),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get today's interest stocks based on composite scoring.
 
     Combines KIS rankings, theme classification, factor signals, and investor flow.
+    If only one of the price/volume rankings fails, the result is built from the
+    other one alone. Complete results are cached per user and limit for a few
+    seconds; a degraded one is not, so the next request retries KIS.
     """
+    cache_key = (user.id, limit)
+    cached = _interest_cache.get(cache_key)
+    if cached:
+        if time.monotonic() - cached[0] < _INTEREST_TTL:
+            return cached[1]
+        _interest_cache.pop(cache_key, None)
+
     try:
         kis = await get_kis_client(user.id, db)
 
-        # Fetch price + volume rankings in parallel
-        price_data = await kis.get_price_ranking(direction="up", limit=30)
-        volume_data = await kis.get_volume_ranking(limit=30)
+        # Fetch price + volume rankings in parallel; a failed source counts as
+        # empty, so one KIS error degrades the result instead of emptying it.
+        # BaseException also covers a sub-request's CancelledError.
+        price_data, volume_data = await asyncio.gather(
+            kis.get_price_ranking(direction="up", limit=30),
+            kis.get_volume_ranking(limit=30),
+            return_exceptions=True,
+        )
+        degraded = False
+        if isinstance(price_data, BaseException):
+            logger.warning("Failed to fetch price rankings for interest stocks: %s", price_data)
+            price_data, degraded = [], True
+        if isinstance(volume_data, BaseException):
+            logger.warning("Failed to fetch volume rankings for interest stocks: %s", volume_data)
+            volume_data, degraded = [], True
 
         # Build theme info for ranked stocks
         stock_themes: dict[str, list[str]] = {}
@@ -150,7 +208,10 @@ async def get_interest_stocks(
             stock_themes=stock_themes,
             limit=limit,
         )
-        return [InterestStock(**item) for item in results]
+        stocks = [InterestStock(**item) for item in results]
+        if stocks and not degraded:
+            _cache_interest_stocks(cache_key, stocks)
+        return stocks
 
     except Exception as e:
         logger.warning("Failed to build interest stocks: %s", e)
@@ -172,18 +233,22 @@ async def get_trending_stocks(
         return []
 
 
-@router.get("/catalog")
+# Static: the ranking types are fixed and the theme list is built at import
+_CATALOG = {
+    "rankings": (
+        {"type": "price", "label": "상승/하락률 순위", "description": "당일 등락률 기준"},
+        {"type": "volume", "label": "거래량 순위", "description": "당일 누적 거래량 기준"},
+        {"type": "trending", "label": "인기 검색", "description": "네이버 금융 인기 검색 종목"},
+        {"type": "themes", "label": "테마 분류", "description": "섹터 기반 테마 그룹핑"},
+        {"type": "interest", "label": "관심종목", "description": "복합 점수 기반 추천"},
+    ),
+    "theme_count": len(list_all_themes()),
+}
+
+
+@router.get("/catalog", response_model=RankingsCatalog)
 async def get_rankings_catalog(
     user: User = Depends(get_current_user),
 ):
     """Return available ranking types and their descriptions."""
-    return {
-        "rankings": [
-            {"type": "price", "label": "상승/하락률 순위", "description": "당일 등락률 기준"},
-            {"type": "volume", "label": "거래량 순위", "description": "당일 누적 거래량 기준"},
-            {"type": "trending", "label": "인기 검색", "description": "네이버 금융 인기 검색 종목"},
-            {"type": "themes", "label": "테마 분류", "description": "섹터 기반 테마 그룹핑"},
-            {"type": "interest", "label": "관심종목", "description": "복합 점수 기반 추천"},
-        ],
-        "theme_count": len(list_all_themes()),
-    }
+    return _CATALOG
@@ -19,24 +19,24 @@ logger = logging.getLogger(__name__)
 
 # ── Korean sentiment lexicon ─────────────────────────────
 
-POSITIVE_KEYWORDS = [
+POSITIVE_KEYWORDS = (
     "급등", "상승", "호재", "최고", "돌파", "신고가", "흑자", "성장",
     "매수", "강세", "반등", "회복", "상향", "호실적", "사상최고",
     "개선", "확대", "증가", "수주", "계약", "인수합병", "배당",
     "목표가상향", "실적개선", "영업이익", "순이익", "기대",
     "호조", "수혜", "긍정", "유망", "추천", "우상향",
-]
+)
 
-NEGATIVE_KEYWORDS = [
+NEGATIVE_KEYWORDS = (
     "급락", "하락", "악재", "최저", "폭락", "적자", "손실",
     "매도", "약세", "하향", "리스크", "위기", "경고", "부진",
     "감소", "축소", "하방", "불안", "우려", "제재", "조사",
     "목표가하향", "실적부진", "영업손실", "순손실", "충격",
     "악화", "둔화", "부담", "피해", "규제", "소송",
-]
+)
 
-STRONG_POSITIVE = ["급등", "사상최고", "신고가", "호실적", "흑자전환"]
-STRONG_NEGATIVE = ["급락", "폭락", "적자전환", "상장폐지", "부도"]
+STRONG_POSITIVE = ("급등", "사상최고", "신고가", "호실적", "흑자전환")
+STRONG_NEGATIVE = ("급락", "폭락", "적자전환", "상장폐지", "부도")
 
 
 @dataclass
@@ -63,21 +63,12 @@ class NewsSentiment:
 
 def analyze_headline_sentiment(title: str) -> float:
     """Score a single Korean headline. Returns -1.0 to 1.0."""
-    score = 0.0
-
-    for kw in STRONG_POSITIVE:
-        if kw in title:
-            score += 2.0
-    for kw in STRONG_NEGATIVE:
-        if kw in title:
-            score -= 2.0
-
-    for kw in POSITIVE_KEYWORDS:
-        if kw in title:
-            score += 1.0
-    for kw in NEGATIVE_KEYWORDS:
-        if kw in title:
-            score -= 1.0
+    score = 2.0 * (
+        sum(kw in title for kw in STRONG_POSITIVE)
+        - sum(kw in title for kw in STRONG_NEGATIVE)
+    )
+    score += sum(kw in title for kw in POSITIVE_KEYWORDS)
+    score -= sum(kw in title for kw in NEGATIVE_KEYWORDS)
 
     # Clamp to [-1, 1]
     if score > 0:
@@ -2,16 +2,20 @@
 
 Dispatches notifications to multiple channels:
 - In-app (DB-stored notifications)
-- WebSocket (real-time push to connected clients)
+- WebSocket (real-time push to connected clients, dispatched in the background)
 - Email (async via SMTP for important events)
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Strong references to in-flight WebSocket pushes (the event loop only keeps weak ones)
+_pending_pushes: set[asyncio.Task] = set()
+
 
 class NotificationCategory(str, Enum):
     TRADE = "trade"
@@ -53,10 +57,12 @@ class NotificationService:
                 logger.error(f"Failed to save notification: {e}")
                 results["in_app"] = {"status": "error", "error": str(e)}
 
-        # 2. WebSocket (real-time push)
+        # 2. WebSocket (real-time push, fire-and-forget)
         try:
-            await NotificationService._send_websocket(payload)
-            results["websocket"] = {"status": "ok"}
+            task = asyncio.create_task(NotificationService._send_websocket(payload))
+            _pending_pushes.add(task)
+            task.add_done_callback(NotificationService._on_push_done)
+            results["websocket"] = {"status": "scheduled"}
         except Exception as e:
             logger.error(f"WebSocket notification failed: {e}")
             results["websocket"] = {"status": "error", "error": str(e)}
@@ -72,6 +78,36 @@ class NotificationService:
 
         return results
 
+    @staticmethod
+    async def flush() -> None:
+        """Wait for WebSocket pushes scheduled on the running loop.
+
+        Call before closing a short-lived event loop (e.g. from Celery tasks)
+        so pending pushes are not destroyed with it.
+        """
+        loop = asyncio.get_running_loop()
+        pending = [t for t in _pending_pushes if t.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    async def run_and_flush(coro):
+        """Await ``coro``, then wait for the WebSocket pushes it scheduled.
+
+        Wrap every coroutine a Celery task runs on its own event loop with
+        this; ``asyncio.run`` cancels still-pending pushes on shutdown.
+        """
+        try:
+            return await coro
+        finally:
+            await NotificationService.flush()
+
+    @staticmethod
+    def _on_push_done(task: asyncio.Task) -> None:
+        _pending_pushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"WebSocket notification failed: {task.exception()}")
+
     @staticmethod
     async def _save_to_db(payload: NotificationPayload, db) -> str:
         """Save notification to database."""
@@ -15,11 +15,14 @@ from __future__ import annotations
 
 import logging
 import uuid
+from bisect import bisect_right
 from datetime import date, timedelta
+from operator import itemgetter
 from typing import Any
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
@@ -37,29 +40,36 @@ def extract_rise_events(
         window_days: Look-ahead window for measuring rise
 
     Returns:
-        List of {date, close, future_close, return_pct}
+        List of {index, date, close, future_close, return_pct}
     """
     if len(price_data) < window_days + 1:
         return []
 
-    events = []
-    closes = price_data["close"].values
-    dates = price_data["date"].values if "date" in price_data.columns else list(range(len(closes)))
+    closes = price_data["close"].to_numpy()
+    dates = price_data["date"].values if "date" in price_data.columns else range(len(closes))
 
-    for i in range(len(closes) - window_days):
-        future_max = max(closes[i + 1: i + window_days + 1])
-        return_pct = (future_max - closes[i]) / closes[i] * 100
+    # Row i of the window view is closes[i + 1 : i + window_days + 1]
+    future_max = sliding_window_view(closes[1:], window_days).max(axis=1)
+    base = closes[: len(future_max)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return_pct = (future_max - base) / base * 100
 
-        if return_pct >= threshold_pct:
-            events.append({
-                "index": i,
-                "date": dates[i],
-                "close": float(closes[i]),
-                "future_close": float(future_max),
-                "return_pct": float(return_pct),
-            })
-
-    return events
+    idx = np.flatnonzero(return_pct >= threshold_pct)
+    return [
+        {
+            "index": i,
+            "date": dates[i],
+            "close": c,
+            "future_close": f,
+            "return_pct": r,
+        }
+        for i, c, f, r in zip(
+            idx.tolist(),
+            base[idx].astype(np.float64).tolist(),
+            future_max[idx].astype(np.float64).tolist(),
+            return_pct[idx].astype(np.float64).tolist(),
+        )
+    ]
 
 
 def build_feature_matrix(
@@ -77,39 +87,41 @@ def build_feature_matrix(
     Returns:
         (X, y, feature_names) where X is (n_samples, n_features), y is (n_samples,)
     """
-    all_indices = event_indices + non_event_indices
-    labels = [1] * len(event_indices) + [0] * len(non_event_indices)
+    keys = [str(idx) for idx in event_indices + non_event_indices]
+    labels = np.array([1] * len(event_indices) + [0] * len(non_event_indices), dtype=np.int32)
 
     # Determine feature names from first available snapshot
     feature_names = []
-    for idx in all_indices:
-        key = str(idx)
-        if key in factor_snapshots and factor_snapshots[key]:
+    for key in keys:
+        if factor_snapshots.get(key):
             feature_names = sorted(factor_snapshots[key].keys())
             break
 
     if not feature_names:
         return np.array([]), np.array([]), []
 
-    rows = []
-    valid_labels = []
-    for idx, label in zip(all_indices, labels):
-        key = str(idx)
-        if key not in factor_snapshots:
-            continue
-        snapshot = factor_snapshots[key]
-        row = [snapshot.get(f, 0.0) for f in feature_names]
-        rows.append(row)
-        valid_labels.append(label)
-
-    if not rows:
-        return np.array([]), np.array([]), feature_names
-
-    X = np.array(rows, dtype=np.float64)
-    y = np.array(valid_labels, dtype=np.int32)
+    present = np.array([key in factor_snapshots for key in keys], dtype=bool)
+    valid_keys = [key for key, ok in zip(keys, present) if ok]
+
+    X = np.empty((len(valid_keys), len(feature_names)), dtype=np.float64)
+    getter = itemgetter(*feature_names)
+    try:
+        # Uniform snapshots (the common case): one C-level fetch per row
+        for row, key in enumerate(valid_keys):
+            X[row] = getter(factor_snapshots[key])
+    except (KeyError, TypeError, ValueError):
+        # Ragged or non-numeric snapshots: bulk-load and let reindex fill the
+        # gaps with NaN, which is zeroed below
+        frame = pd.DataFrame.from_dict(
+            {key: factor_snapshots[key] for key in dict.fromkeys(valid_keys)}, orient="index",
+        )
+        X = frame.reindex(index=valid_keys, columns=feature_names).to_numpy(
+            dtype=np.float64, copy=True,
+        )
+    y = labels[present]
 
-    # Replace NaN/Inf
-    X = np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0)
+    # Replace NaN/Inf in one in-place pass (X is a fresh array)
+    np.nan_to_num(X, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
 
     return X, y, feature_names
 
@@ -186,8 +198,10 @@ def train_classifier(
     }
 
     # Feature importance
-    importance = dict(zip(feature_names, model.feature_importances_.tolist()))
-    importance = dict(sorted(importance.items(), key=lambda x: x[1], reverse=True))
+    # Stable descending order keeps ties in feature order, like sorted(reverse=True)
+    imp = model.feature_importances_
+    order = np.argsort(-imp, kind="stable")
+    importance = dict(zip((feature_names[i] for i in order), imp[order].tolist()))
 
     return {
         "feature_importance": importance,
@@ -215,26 +229,26 @@ def generate_screening_rule(
     if len(feature_importance) == 0 or len(X) == 0:
         return {"rules": [], "min_match": 0}
 
-    # Get top N factors
-    top_factors = list(feature_importance.keys())[:top_n]
+    # Get top N factors (feature_importance is already ranked)
     factor_indices = {name: i for i, name in enumerate(feature_names)}
+    top_factors = [f for f in list(feature_importance)[:top_n] if f in factor_indices]
+    if not top_factors:
+        return {"rules": [], "min_match": 1}
+
+    # Column medians for all selected factors in one reduction
+    medians = np.median(X[:, [factor_indices[f] for f in top_factors]], axis=0)
 
-    rules = []
-    for factor in top_factors:
-        if factor not in factor_indices:
-            continue
-        idx = factor_indices[factor]
-        col_values = X[:, idx]
-        median = float(np.median(col_values))
-
-        # Determine direction based on feature behavior
-        # If higher value correlates with events, use >=; otherwise <=
-        rules.append({
+    # Determine direction based on feature behavior
+    # If higher value correlates with events, use >=; otherwise <=
+    rules = [
+        {
             "factor": factor,
             "operator": ">=",
-            "threshold": round(median, 4),
+            "threshold": round(float(median), 4),
             "importance": round(feature_importance[factor], 4),
-        })
+        }
+        for factor, median in zip(top_factors, medians)
+    ]
 
     return {
         "rules": rules,
@@ -242,14 +256,14 @@ def generate_screening_rule(
     }
 
 
+# Lower f1 bound of grades C, B, A; anything below (or NaN) is D
+_GRADE_CUTS = (0.3, 0.5, 0.7)
+_GRADES = ("D", "C", "B", "A")
+
+
 def grade_pattern(metrics: dict[str, float]) -> str:
     """Assign a letter grade based on model metrics."""
     f1 = metrics.get("f1", 0)
-    if f1 >= 0.7:
-        return "A"
-    elif f1 >= 0.5:
-        return "B"
-    elif f1 >= 0.3:
-        return "C"
-    else:
+    if f1 != f1:  # NaN
         return "D"
+    return _GRADES[bisect_right(_GRADE_CUTS, f1)]
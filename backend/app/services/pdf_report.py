@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import io
+from bisect import bisect_right
+from collections.abc import Mapping
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 from reportlab.lib import colors
@@ -23,11 +27,18 @@ RED = colors.HexColor("#EF4444")
 GRAY = colors.HexColor("#6B7280")
 DARK = colors.HexColor("#1F2937")
 
+_DOC_KWARGS = MappingProxyType({
+    "pagesize": A4,
+    "leftMargin": MARGIN, "rightMargin": MARGIN,
+    "topMargin": MARGIN, "bottomMargin": MARGIN,
+})
 
-def _build_styles() -> dict[str, ParagraphStyle]:
-    """Create custom paragraph styles."""
+
+@lru_cache(maxsize=1)
+def _build_styles() -> Mapping[str, ParagraphStyle]:
+    """Create custom paragraph styles (built once, shared read-only)."""
     base = getSampleStyleSheet()
-    return {
+    return MappingProxyType({
         "title": ParagraphStyle(
             "Title", parent=base["Title"],
             fontSize=22, textColor=DARK, spaceAfter=6,
@@ -48,7 +59,23 @@ def _build_styles() -> dict[str, ParagraphStyle]:
             "Small", parent=base["Normal"],
             fontSize=8, textColor=GRAY,
         ),
-    }
+    })
+
+
+# Shared by every table: setStyle() only reads the commands, so one instance is enough
+_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), BRAND_COLOR),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTSIZE", (0, 0), (-1, 0), 9),
+    ("FONTSIZE", (0, 1), (-1, -1), 8),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#D1D5DB")),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+])
 
 
 def _make_table(headers: list[str], rows: list[list[str]],
@@ -56,28 +83,23 @@ def _make_table(headers: list[str], rows: list[list[str]],
     """Build a styled table from header + row data."""
     data = [headers] + rows
     t = Table(data, colWidths=col_widths, repeatRows=1)
-    t.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), BRAND_COLOR),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("FONTSIZE", (0, 0), (-1, 0), 9),
-        ("FONTSIZE", (0, 1), (-1, -1), 8),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#D1D5DB")),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F9FAFB")]),
-        ("TOPPADDING", (0, 0), (-1, -1), 4),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-    ]))
+    t.setStyle(_TABLE_STYLE)
     return t
 
 
+# Magnitude bands for _format_won: (divisor, format spec, suffix), indexed by
+# bisecting abs(value) into _WON_THRESHOLDS.
+_WON_THRESHOLDS = (1e4, 1e8)
+_WON_BANDS = (
+    (1, ",.0f", ""),
+    (1e4, ",.0f", "만"),
+    (1e8, ",.1f", "억"),
+)
+
+
 def _format_won(value: float) -> str:
-    if abs(value) >= 1e8:
-        return f"₩{value / 1e8:,.1f}억"
-    if abs(value) >= 1e4:
-        return f"₩{value / 1e4:,.0f}만"
-    return f"₩{value:,.0f}"
+    divisor, spec, suffix = _WON_BANDS[bisect_right(_WON_THRESHOLDS, abs(value))]
+    return f"₩{format(value / divisor, spec)}{suffix}"
 
 
 def _pnl_str(value: float) -> str:
@@ -97,11 +119,7 @@ def generate_portfolio_report(
         PDF content as bytes
     """
     buf = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buf, pagesize=A4,
-        leftMargin=MARGIN, rightMargin=MARGIN,
-        topMargin=MARGIN, bottomMargin=MARGIN,
-    )
+    doc = SimpleDocTemplate(buf, **_DOC_KWARGS)
 
     styles = _build_styles()
     elements: list[Any] = []
@@ -226,11 +244,7 @@ def generate_backtest_report(
         PDF content as bytes
     """
     buf = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buf, pagesize=A4,
-        leftMargin=MARGIN, rightMargin=MARGIN,
-        topMargin=MARGIN, bottomMargin=MARGIN,
-    )
+    doc = SimpleDocTemplate(buf, **_DOC_KWARGS)
 
     styles = _build_styles()
     elements: list[Any] = []
@@ -15,7 +15,7 @@ from app.models.api_credential import ApiCredential
 from app.core.encryption import get_vault
 
 from app.services.notification_service import (
-    notify_agent_completed, notify_agent_error,
+    NotificationService, notify_agent_completed, notify_agent_error,
 )
 
 logger = logging.getLogger(__name__)
@@ -26,7 +26,7 @@ def _send_notification_sync(coro):
     import asyncio
     try:
         loop = asyncio.new_event_loop()
-        loop.run_until_complete(coro)
+        loop.run_until_complete(NotificationService.run_and_flush(coro))
         loop.close()
     except Exception as exc:
         logger.warning(f"Notification dispatch failed: {exc}")
@@ -163,7 +163,7 @@ def run_agent_session(self, user_id: str, session_id: str, session_type: str = "
 
         # Run the graph (synchronous invocation)
         final_state = asyncio.get_event_loop().run_until_complete(
-            _run_graph_async(graph, initial_state, db, sid)
+            NotificationService.run_and_flush(_run_graph_async(graph, initial_state, db, sid))
         ) if not asyncio.get_event_loop().is_running() else _run_graph_sync(graph, initial_state, db, sid)
 
         # Update session with results
@@ -242,7 +242,7 @@ def _run_graph_sync(graph, initial_state, db, session_id):
     asyncio.set_event_loop(loop)
     try:
         return loop.run_until_complete(
-            _run_graph_async(graph, initial_state, db, session_id)
+            NotificationService.run_and_flush(_run_graph_async(graph, initial_state, db, session_id))
         )
     finally:
         loop.close()
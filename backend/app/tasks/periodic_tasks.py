@@ -1,7 +1,9 @@
 """Periodic Celery tasks for automated trading operations."""
 
+import json
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from decimal import Decimal
 
@@ -22,8 +24,14 @@ from app.integrations.kis.constants import (
     PAPER_BASE_URL, REAL_BASE_URL, STOCK_PRICE_PATH, TR_ID_PRICE,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+
 # P&L alert thresholds (percentage) and dedup tracking
 PNL_ALERT_THRESHOLDS = [5, 10, 20]
 _last_pnl_alert: dict[tuple[str, str], int] = {}  # (user_id, stock_code) → last alerted threshold
@@ -43,10 +51,12 @@ def _get_pnl_threshold(pnl_pct: float) -> int | None:
 def _send_pnl_notification(user_id_str: str, stock_code: str, pnl: float, pnl_pct: float):
     """Send P&L alert notification (sync wrapper)."""
     import asyncio
-    from app.services.notification_service import notify_pnl_alert
+    from app.services.notification_service import NotificationService, notify_pnl_alert
     try:
         loop = asyncio.new_event_loop()
-        loop.run_until_complete(notify_pnl_alert(user_id_str, stock_code, pnl, pnl_pct))
+        loop.run_until_complete(
+            NotificationService.run_and_flush(notify_pnl_alert(user_id_str, stock_code, pnl, pnl_pct))
+        )
         loop.close()
     except Exception as exc:
         logger.warning(f"P&L notification failed for {stock_code}: {exc}")
@@ -380,6 +390,45 @@ def _fetch_kis_prices_for_user(user_id, stock_codes: list[str], db_session) -> d
         return {}
 
 
+def _dumps_cache_payload(payload) -> bytes | str:
+    """Serialize a Redis cache payload, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload)
+
+
+def _flush_cache_writes(pipe) -> None:
+    """Send queued Redis cache writes; a Redis failure is logged, not raised."""
+    from redis.exceptions import RedisError
+
+    try:
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Redis cache flush failed: {e}")
+
+
+# Upper bound on concurrent Yahoo OHLCV downloads per monitoring run
+_OHLCV_FETCH_WORKERS = 8
+
+
+def _prefetch_ohlcv(provider, stock_codes: list[str], start_date: str, end_date: str) -> dict:
+    """Fetch OHLCV for each stock concurrently.
+
+    Returns {stock_code: DataFrame | Exception}; a failed fetch is returned, not
+    raised, so the caller can skip just that stock.
+    """
+    def _fetch(code):
+        try:
+            return provider.get_ohlcv(code, start_date, end_date)
+        except Exception as e:
+            return e
+
+    if not stock_codes:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(_OHLCV_FETCH_WORKERS, len(stock_codes))) as pool:
+        return dict(zip(stock_codes, pool.map(_fetch, stock_codes)))
+
+
 def _append_realtime_bar(df, price_data: dict):
     """Append today's real-time OHLCV bar to historical DataFrame.
 
@@ -422,7 +471,6 @@ def monitor_active_recipes():
     runs SignalComposer, and caches entry/exit signals to Redis.
     """
     import asyncio
-    import json
     import redis
     from datetime import datetime as dt, timedelta
     from app.analysis.composer import SignalComposer
@@ -441,6 +489,8 @@ def monitor_active_recipes():
         composer = SignalComposer()
         provider = get_data_provider("yahoo")
         r = redis.from_url(settings.redis_url)
+        # Signal cache writes are queued and sent in one round-trip per recipe
+        pipe = r.pipeline(transaction=False)
 
         end_date = dt.now().strftime("%Y-%m-%d")
         start_date = (dt.now() - timedelta(days=365)).strftime("%Y-%m-%d")
@@ -461,8 +511,12 @@ def monitor_active_recipes():
                 user_prices[uid] = _fetch_kis_prices_for_user(uid, list(all_codes), db)
                 logger.info(f"KIS prices fetched for user {uid[:8]}...: {len(user_prices[uid])}/{len(all_codes)} stocks")
 
-        # Yahoo OHLCV cache to avoid re-fetching same stock
-        ohlcv_cache: dict[str, object] = {}
+        # Yahoo OHLCV for every distinct stock, fetched concurrently (network-bound).
+        # Evaluation below stays on this thread since it shares the sync DB session.
+        unique_codes = list(dict.fromkeys(
+            code for rec in recipes for code in (rec.stock_codes or [])
+        ))
+        ohlcv_cache = _prefetch_ohlcv(provider, unique_codes, start_date, end_date)
 
         evaluated = 0
         signals_found = 0
@@ -476,126 +530,131 @@ def monitor_active_recipes():
 
             kis_prices = user_prices.get(str(recipe.user_id), {})
 
-            for stock_code in stock_codes:
-                evaluated += 1
-                try:
-                    # Get historical data (cached per stock)
-                    if stock_code not in ohlcv_cache:
-                        ohlcv_cache[stock_code] = provider.get_ohlcv(stock_code, start_date, end_date)
-                    df = ohlcv_cache[stock_code]
-
-                    if df is None or df.empty or len(df) < 60:
-                        logger.debug(f"Insufficient data for {stock_code}, skipping")
-                        continue
-
-                    # Make a copy and append today's real-time bar from KIS
-                    df = df.copy()
-                    kis_price = kis_prices.get(stock_code)
-                    if kis_price:
-                        df = _append_realtime_bar(df, kis_price)
-
-                    entry, exit_ = composer.compose(df, recipe.signal_config)
-
-                    should_enter = bool(entry.iloc[-1]) if len(entry) > 0 else False
-                    should_exit = bool(exit_.iloc[-1]) if len(exit_) > 0 else False
-
-                    # Apply custom filters on entry
-                    if should_enter and recipe.custom_filters:
-                        latest = df.iloc[-1]
-                        volume_min = recipe.custom_filters.get("volume_min")
-                        if volume_min and latest["volume"] < volume_min:
-                            should_enter = False
-                        price_range = recipe.custom_filters.get("price_range")
-                        if should_enter and price_range and len(price_range) == 2:
-                            price = latest["close"]
-                            if price < price_range[0] or price > price_range[1]:
+            # Publish this recipe's signals before moving on, even if it errors out
+            try:
+                for stock_code in stock_codes:
+                    evaluated += 1
+                    try:
+                        # Get historical data (prefetched per stock)
+                        df = ohlcv_cache[stock_code]
+                        if isinstance(df, Exception):
+                            raise df
+
+                        if df is None or df.empty or len(df) < 60:
+                            logger.debug(f"Insufficient data for {stock_code}, skipping")
+                            continue
+
+                        # Make a copy and append today's real-time bar from KIS
+                        df = df.copy()
+                        kis_price = kis_prices.get(stock_code)
+                        if kis_price:
+                            df = _append_realtime_bar(df, kis_price)
+
+                        entry, exit_ = composer.compose(df, recipe.signal_config)
+
+                        should_enter = bool(entry.iloc[-1]) if len(entry) > 0 else False
+                        should_exit = bool(exit_.iloc[-1]) if len(exit_) > 0 else False
+
+                        # Apply custom filters on entry
+                        if should_enter and recipe.custom_filters:
+                            latest = df.iloc[-1]
+                            volume_min = recipe.custom_filters.get("volume_min")
+                            if volume_min and latest["volume"] < volume_min:
                                 should_enter = False
-
-                    if should_enter or should_exit:
-                        signals_found += 1
-                        signal_type = "entry" if should_enter else "exit"
-                        signal_data = {
-                            "recipe_id": str(recipe.id),
-                            "recipe_name": recipe.name,
-                            "stock_code": stock_code,
-                            "should_enter": should_enter,
-                            "should_exit": should_exit,
-                            "signal_type": signal_type,
-                            "timestamp": dt.now().isoformat(),
-                        }
-                        r.set(
-                            f"recipe:{recipe.id}:signal:{stock_code}",
-                            json.dumps(signal_data),
-                            ex=600,  # 10 min TTL
-                        )
-                        logger.info(
-                            f"Signal detected: recipe='{recipe.name}' stock={stock_code} "
-                            f"enter={should_enter} exit={should_exit}"
-                        )
-
-                        # Send notification
-                        notifications_sent += _send_signal_notification(
-                            db, recipe, stock_code, signal_type,
-                        )
-
-                        # Auto-execute if enabled
-                        if recipe.auto_execute:
-                            from app.models.order import Order
-                            cutoff = datetime.now(timezone.utc) - timedelta(minutes=5)
-                            existing = db.query(Order).filter(
-                                Order.recipe_id == recipe.id,
-                                Order.stock_code == stock_code,
-                                Order.submitted_at >= cutoff,
-                            ).first()
-
-                            if existing:
-                                logger.info(
-                                    f"Skip auto-exec: duplicate order for recipe='{recipe.name}' "
-                                    f"stock={stock_code} within 5 min"
-                                )
-                            else:
-                                try:
-                                    from app.db.session import async_session_factory
-                                    from app.services.recipe_executor import RecipeExecutor
-
-                                    async def _auto_exec():
-                                        async with async_session_factory() as async_db:
-                                            executor = RecipeExecutor()
-                                            results = await executor.execute(
-                                                user_id=str(recipe.user_id),
-                                                recipe=recipe,
-                                                db=async_db,
-                                                stock_code=stock_code,
-                                            )
-                                            await async_db.commit()
-                                            return results
-
-                                    exec_results = asyncio.run(_auto_exec())
-                                    for er in (exec_results or []):
-                                        if er.get("status") == "submitted":
-                                            auto_executed += 1
-                                            logger.info(
-                                                f"Auto-executed: recipe='{recipe.name}' "
-                                                f"stock={stock_code} side={er.get('side')} "
-                                                f"qty={er.get('quantity')} "
-                                                f"kis_order={er.get('kis_order_id')}"
-                                            )
-                                        else:
-                                            logger.warning(
-                                                f"Auto-exec result: recipe='{recipe.name}' "
-                                                f"stock={stock_code} status={er.get('status')} "
-                                                f"error={er.get('error')}"
-                                            )
-                                except Exception as e:
-                                    logger.error(
-                                        f"Auto-execute failed: recipe='{recipe.name}' "
-                                        f"stock={stock_code}: {e}",
-                                        exc_info=True,
+                            price_range = recipe.custom_filters.get("price_range")
+                            if should_enter and price_range and len(price_range) == 2:
+                                price = latest["close"]
+                                if price < price_range[0] or price > price_range[1]:
+                                    should_enter = False
+
+                        if should_enter or should_exit:
+                            signals_found += 1
+                            signal_type = "entry" if should_enter else "exit"
+                            signal_data = {
+                                "recipe_id": str(recipe.id),
+                                "recipe_name": recipe.name,
+                                "stock_code": stock_code,
+                                "should_enter": should_enter,
+                                "should_exit": should_exit,
+                                "signal_type": signal_type,
+                                "timestamp": dt.now().isoformat(),
+                            }
+                            pipe.set(
+                                f"recipe:{recipe.id}:signal:{stock_code}",
+                                _dumps_cache_payload(signal_data),
+                                ex=600,  # 10 min TTL
+                            )
+                            logger.info(
+                                f"Signal detected: recipe='{recipe.name}' stock={stock_code} "
+                                f"enter={should_enter} exit={should_exit}"
+                            )
+
+                            # Send notification
+                            notifications_sent += _send_signal_notification(
+                                db, recipe, stock_code, signal_type,
+                            )
+
+                            # Auto-execute if enabled
+                            if recipe.auto_execute:
+                                from app.models.order import Order
+                                cutoff = datetime.now(timezone.utc) - timedelta(minutes=5)
+                                existing = db.query(Order).filter(
+                                    Order.recipe_id == recipe.id,
+                                    Order.stock_code == stock_code,
+                                    Order.submitted_at >= cutoff,
+                                ).first()
+
+                                if existing:
+                                    logger.info(
+                                        f"Skip auto-exec: duplicate order for recipe='{recipe.name}' "
+                                        f"stock={stock_code} within 5 min"
                                     )
+                                else:
+                                    try:
+                                        from app.db.session import async_session_factory
+                                        from app.services.notification_service import NotificationService
+                                        from app.services.recipe_executor import RecipeExecutor
+
+                                        async def _auto_exec():
+                                            async with async_session_factory() as async_db:
+                                                executor = RecipeExecutor()
+                                                results = await executor.execute(
+                                                    user_id=str(recipe.user_id),
+                                                    recipe=recipe,
+                                                    db=async_db,
+                                                    stock_code=stock_code,
+                                                )
+                                                await async_db.commit()
+                                                return results
+
+                                        exec_results = asyncio.run(NotificationService.run_and_flush(_auto_exec()))
+                                        for er in (exec_results or []):
+                                            if er.get("status") == "submitted":
+                                                auto_executed += 1
+                                                logger.info(
+                                                    f"Auto-executed: recipe='{recipe.name}' "
+                                                    f"stock={stock_code} side={er.get('side')} "
+                                                    f"qty={er.get('quantity')} "
+                                                    f"kis_order={er.get('kis_order_id')}"
+                                                )
+                                            else:
+                                                logger.warning(
+                                                    f"Auto-exec result: recipe='{recipe.name}' "
+                                                    f"stock={stock_code} status={er.get('status')} "
+                                                    f"error={er.get('error')}"
+                                                )
+                                    except Exception as e:
+                                        logger.error(
+                                            f"Auto-execute failed: recipe='{recipe.name}' "
+                                            f"stock={stock_code}: {e}",
+                                            exc_info=True,
+                                        )
 
-                except Exception as e:
-                    logger.warning(f"Evaluation failed for recipe '{recipe.name}' stock={stock_code}: {e}")
-                    continue
+                    except Exception as e:
+                        logger.warning(f"Evaluation failed for recipe '{recipe.name}' stock={stock_code}: {e}")
+                        continue
+            finally:
+                _flush_cache_writes(pipe)
 
         logger.info(
             f"Recipe monitoring: evaluated={evaluated}, signals={signals_found}, "
@@ -621,7 +680,6 @@ def poll_condition_search():
     Executes condition searches via KIS API and caches results in Redis.
     """
     import asyncio
-    import json
     import redis
     from app.integrations.kis.client import KISClient
 
@@ -654,24 +712,30 @@ def poll_condition_search():
 
         vault = get_vault()
         r = redis.from_url(settings.redis_url)
+        pipe = r.pipeline(transaction=False)
         polled = 0
         errors = 0
         notifications_sent = 0
 
         # Group condition_ids by user_id (one KIS client per user)
         user_conditions: dict[str, list[str]] = {}
+        user_ids: dict[str, object] = {}
         for cid, info in condition_tasks.items():
             uid = str(info["user_id"])
             user_conditions.setdefault(uid, []).append(cid)
+            user_ids.setdefault(uid, info["user_id"])
 
-        for user_id_str, condition_ids in user_conditions.items():
-            # Get KIS credentials
-            cred = db.query(ApiCredential).filter(
-                ApiCredential.user_id == user_id_str,
-                ApiCredential.service_type == "kis",
-                ApiCredential.is_active == True,
-            ).first()
+        # KIS credentials for all those users in one query
+        creds_by_user: dict[str, ApiCredential] = {}
+        for c in db.query(ApiCredential).filter(
+            ApiCredential.user_id.in_(list(user_ids.values())),
+            ApiCredential.service_type == "kis",
+            ApiCredential.is_active == True,
+        ).all():
+            creds_by_user.setdefault(str(c.user_id), c)
 
+        for user_id_str, condition_ids in user_conditions.items():
+            cred = creds_by_user.get(user_id_str)
             if not cred:
                 logger.warning(f"No KIS credentials for user {user_id_str}, skipping condition search")
                 continue
@@ -690,27 +754,30 @@ def poll_condition_search():
                 is_paper=cred.is_paper_trading,
             )
 
-            for cid in condition_ids:
-                try:
-                    results = asyncio.run(kis.run_condition_search(cid))
-                    r.set(
-                        f"condition:{cid}:results",
-                        json.dumps(results),
-                        ex=900,  # 15 min TTL
-                    )
-                    polled += 1
-                    logger.info(f"Condition search {cid}: {len(results)} stocks matched")
-
-                    # Send notification if matches found
-                    if results:
-                        cond_name = condition_tasks[cid].get("condition_name", cid)
-                        user_id_val = condition_tasks[cid]["user_id"]
-                        notifications_sent += _send_condition_notification(
-                            db, user_id_val, cid, cond_name, results,
+            try:
+                for cid in condition_ids:
+                    try:
+                        results = asyncio.run(kis.run_condition_search(cid))
+                        pipe.set(
+                            f"condition:{cid}:results",
+                            _dumps_cache_payload(results),
+                            ex=900,  # 15 min TTL
                         )
-                except Exception as e:
-                    errors += 1
-                    logger.warning(f"Condition search failed for {cid}: {e}")
+                        polled += 1
+                        logger.info(f"Condition search {cid}: {len(results)} stocks matched")
+
+                        # Send notification if matches found
+                        if results:
+                            cond_name = condition_tasks[cid].get("condition_name", cid)
+                            user_id_val = condition_tasks[cid]["user_id"]
+                            notifications_sent += _send_condition_notification(
+                                db, user_id_val, cid, cond_name, results,
+                            )
+                    except Exception as e:
+                        errors += 1
+                        logger.warning(f"Condition search failed for {cid}: {e}")
+            finally:
+                _flush_cache_writes(pipe)
 
         logger.info(f"Condition search polling: polled={polled}, errors={errors}, notifications={notifications_sent}")
         return {"status": "ok", "polled": polled, "errors": errors, "notifications": notifications_sent}
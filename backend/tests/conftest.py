@@ -1,9 +1,68 @@
+import os
+
 import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
 
+def pytest_configure(config):
+    """Provide a Fernet ENCRYPTION_KEY before test modules import app settings.
+
+    The generated key is kept in the pytest cache so repeated runs (and
+    xdist workers) reuse it instead of generating a new one each time.
+    """
+    if os.environ.get("ENCRYPTION_KEY"):
+        return
+    cache = getattr(config, "cache", None)
+    key = cache.get("able/fernet_key", None) if cache is not None else None
+    if key is None:
+        from cryptography.fernet import Fernet
+        key = Fernet.generate_key().decode()
+        if cache is not None:
+            cache.set("able/fernet_key", key)
+    os.environ["ENCRYPTION_KEY"] = key
+
+
+_DURATIONS_KEY = "able/durations"
+_durations: dict[str, float] = {}  # nodeid -> call duration for this run
+
+
+def pytest_collection_modifyitems(config, items):
+    """Run the test files that were slowest last time first.
+
+    Files keep their internal order so module-scoped fixtures are still set
+    up once, and ``--ff`` still moves previous failures to the front.
+    Slow-first ordering mainly helps ``-n auto --dist loadfile``, where it
+    keeps one long file from finishing alone at the end of the run.
+    """
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return
+    durations = cache.get(_DURATIONS_KEY, {})
+    if not durations:
+        return
+    file_totals: dict[str, float] = {}
+    for item in items:
+        path = item.nodeid.split("::", 1)[0]
+        file_totals[path] = file_totals.get(path, 0.0) + durations.get(item.nodeid, 0.0)
+    items.sort(key=lambda item: -file_totals[item.nodeid.split("::", 1)[0]])
+
+
+def pytest_runtest_logreport(report):
+    if report.when == "call":
+        _durations[report.nodeid] = report.duration
+
+
+def pytest_sessionfinish(session):
+    cache = getattr(session.config, "cache", None)
+    if cache is None or hasattr(session.config, "workerinput") or not _durations:
+        return
+    stored = cache.get(_DURATIONS_KEY, {})
+    stored.update(_durations)
+    cache.set(_DURATIONS_KEY, stored)
+
+
 @pytest.fixture(autouse=True)
 def _reset_security_state():
     """Reset rate limiter and account lockout between tests."""
@@ -16,6 +75,24 @@ def _reset_security_state():
     get_account_lockout().reset()
 
 
+@pytest.fixture(scope="session")
+def asgi_app():
+    """FastAPI app built once per session.
+
+    Tests install their own ``dependency_overrides`` and must clear them on
+    teardown so the shared app stays isolated between tests.
+    """
+    from app.main import create_app
+    return create_app()
+
+
+@pytest.fixture(scope="session")
+def asgi_transport(asgi_app):
+    """ASGI transport bound to the session-wide app."""
+    from httpx import ASGITransport
+    return ASGITransport(app=asgi_app)
+
+
 @pytest.fixture
 def sample_ohlcv():
     """Generate sample OHLCV data for testing."""
@@ -95,6 +95,15 @@ class TestComputeSMA:
         result = compute_sma(s, 20)
         assert result.iloc[-1] == 10.0
 
+    def test_sma_matches_pandas_rolling(self):
+        close = make_ohlcv_df(200)["close"]
+        expected = close.rolling(window=20, min_periods=20).mean()
+        pd.testing.assert_series_equal(compute_sma(close, 20), expected)
+
+    def test_sma_period_longer_than_series(self):
+        s = pd.Series([1.0, 2.0, 3.0])
+        assert compute_sma(s, 5).isna().all()
+
 
 class TestComputeRSI:
     def test_rsi_range(self):
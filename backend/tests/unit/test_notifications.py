@@ -1,9 +1,20 @@
 """Tests for notification system: service, API, channels."""
 
+import asyncio
 import uuid
+from dataclasses import dataclass
+from types import SimpleNamespace
+
 import pytest
+import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from httpx import AsyncClient
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.deps import get_current_user
+from app.db.session import get_db
 from app.services.notification_service import (
     NotificationService, NotificationPayload, NotificationCategory,
     notify_order_filled, notify_order_rejected,
@@ -11,7 +22,6 @@ from app.services.notification_service import (
     notify_pending_approval, notify_pnl_alert,
 )
 
-
 # ── NotificationPayload Tests ──
 
 
@@ -45,24 +55,27 @@ class TestNotificationPayload:
 
 class TestNotificationCategories:
     def test_all_categories(self):
-        cats = [c.value for c in NotificationCategory]
-        assert "trade" in cats
-        assert "agent" in cats
-        assert "order" in cats
-        assert "position" in cats
-        assert "system" in cats
-        assert "alert" in cats
+        assert {"trade", "agent", "order", "position", "system", "alert"} <= {
+            c.value for c in NotificationCategory
+        }
 
 
 # ── NotificationService Tests ──
+#
+# The async classes below share one event loop per module rather than
+# creating a fresh loop for every test.
 
 
-class TestNotificationService:
-    @pytest.mark.asyncio
-    async def test_send_saves_to_db(self):
-        mock_db = AsyncMock()
-        mock_db.add = MagicMock()
+@pytest.fixture
+def mock_db():
+    db = AsyncMock(spec=AsyncSession)
+    db.add = MagicMock()
+    return db
 
+
+@pytest.mark.asyncio(loop_scope="module")
+class TestNotificationService:
+    async def test_send_saves_to_db(self, mock_db):
         payload = NotificationPayload(
             user_id=str(uuid.uuid4()),
             category=NotificationCategory.ORDER,
@@ -77,7 +90,6 @@ class TestNotificationService:
         mock_db.add.assert_called_once()
         mock_db.flush.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_send_pushes_websocket(self):
         payload = NotificationPayload(
             user_id="user1",
@@ -88,11 +100,31 @@ class TestNotificationService:
 
         with patch("app.services.notification_service.NotificationService._send_websocket", new_callable=AsyncMock) as mock_ws:
             results = await NotificationService.send(payload)
+            # The push runs as a background task; let it get scheduled
+            await asyncio.sleep(0)
 
-        assert results["websocket"]["status"] == "ok"
+        assert results["websocket"]["status"] == "scheduled"
         mock_ws.assert_called_once_with(payload)
+        mock_ws.assert_awaited_once()
+
+    async def test_websocket_failure_does_not_reach_caller(self):
+        payload = NotificationPayload(
+            user_id="user1",
+            category=NotificationCategory.SYSTEM,
+            title="Test",
+            message="Test",
+        )
+
+        with patch.object(
+            NotificationService, "_send_websocket",
+            new_callable=AsyncMock, side_effect=ConnectionError("WS down"),
+        ) as mock_ws:
+            results = await NotificationService.send(payload)
+            await NotificationService.flush()
+
+        assert results["websocket"]["status"] == "scheduled"
+        mock_ws.assert_awaited_once()
 
-    @pytest.mark.asyncio
     async def test_send_without_db(self):
         payload = NotificationPayload(
             user_id="user1",
@@ -105,9 +137,8 @@ class TestNotificationService:
             results = await NotificationService.send(payload, db=None)
 
         assert "in_app" not in results  # No DB, no in-app save
-        assert results["websocket"]["status"] == "ok"
+        assert results["websocket"]["status"] == "scheduled"
 
-    @pytest.mark.asyncio
     async def test_send_email_when_requested(self):
         payload = NotificationPayload(
             user_id="user1",
@@ -123,7 +154,6 @@ class TestNotificationService:
 
         mock_email.assert_called_once_with(payload)
 
-    @pytest.mark.asyncio
     async def test_send_no_email_by_default(self):
         payload = NotificationPayload(
             user_id="user1",
@@ -138,7 +168,6 @@ class TestNotificationService:
 
         mock_email.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_websocket_channel_calls_manager(self):
         payload = NotificationPayload(
             user_id="user1",
@@ -159,10 +188,8 @@ class TestNotificationService:
             assert msg["type"] == "notification"
             assert msg["category"] == "trade"
 
-    @pytest.mark.asyncio
-    async def test_db_error_doesnt_crash(self):
-        mock_db = AsyncMock()
-        mock_db.add = MagicMock(side_effect=Exception("DB error"))
+    async def test_db_error_doesnt_crash(self, mock_db):
+        mock_db.add.side_effect = Exception("DB error")
 
         payload = NotificationPayload(
             user_id=str(uuid.uuid4()),
@@ -175,163 +202,149 @@ class TestNotificationService:
             results = await NotificationService.send(payload, db=mock_db)
 
         assert results["in_app"]["status"] == "error"
-        assert results["websocket"]["status"] == "ok"
+        assert results["websocket"]["status"] == "scheduled"
+
+
+class TestRunAndFlush:
+    """Celery tasks run notifications on a short-lived loop via asyncio.run."""
+
+    def test_push_completes_before_loop_closes(self):
+        payload = NotificationPayload(
+            user_id="user1",
+            category=NotificationCategory.TRADE,
+            title="Order Filled",
+            message="Test",
+        )
+        delivered = []
+
+        async def _slow_push(p):
+            await asyncio.sleep(0.01)
+            delivered.append(p)
+
+        with patch.object(NotificationService, "_send_websocket", side_effect=_slow_push):
+            results = asyncio.run(NotificationService.run_and_flush(NotificationService.send(payload)))
+
+        assert results["websocket"]["status"] == "scheduled"
+        assert delivered == [payload]
 
 
 # ── Convenience Function Tests ──
 
 
+@pytest.mark.asyncio(loop_scope="module")
 class TestConvenienceFunctions:
-    @pytest.mark.asyncio
-    async def test_notify_order_filled(self):
+    @pytest.fixture(autouse=True)
+    def mock_send(self):
         with patch.object(NotificationService, "send", new_callable=AsyncMock) as mock:
-            await notify_order_filled("user1", "005930", "buy", 10, 70000.0)
+            yield mock
+
+    @pytest.mark.parametrize("fn, args, expect", [
+        (notify_order_filled, ("user1", "005930", "buy", 10, 70000.0),
+         {"category": NotificationCategory.ORDER, "title_contains": ["005930", "BUY"]}),
+        (notify_order_rejected, ("user1", "005930", "buy", "insufficient cash"),
+         {"title_contains": ["Rejected"], "message_contains": ["insufficient cash"]}),
+        (notify_agent_started, ("user1", "session-1", "full_cycle"),
+         {"category": NotificationCategory.AGENT, "title_contains": ["Started"]}),
+        (notify_agent_completed, ("user1", "session-1", 3),
+         {"title_contains": ["Completed"], "message_contains": ["3"]}),
+        (notify_agent_error, ("user1", "session-1", "timeout"),
+         {"send_email": True, "title_contains": ["Error"]}),
+        (notify_pending_approval, ("user1", "session-1", 3, 15_000_000),
+         {"send_email": True, "category": NotificationCategory.TRADE, "title_contains": ["Pending"]}),
+        (notify_pnl_alert, ("user1", "005930", -500000, -5.2),
+         {"category": NotificationCategory.ALERT, "title_contains": ["005930", "-5.2%"]}),
+    ], ids=lambda v: v.__name__ if callable(v) else None)
+    async def test_notify_helper_builds_payload(self, mock_send, fn, args, expect):
+        await fn(*args)
+
+        mock_send.assert_called_once()
+        payload = mock_send.call_args[0][0]
+        if "category" in expect:
+            assert payload.category == expect["category"]
+        if "send_email" in expect:
+            assert payload.send_email is expect["send_email"]
+        for text in expect.get("title_contains", []):
+            assert text in payload.title
+        for text in expect.get("message_contains", []):
+            assert text in payload.message
 
-        mock.assert_called_once()
-        payload = mock.call_args[0][0]
-        assert payload.category == NotificationCategory.ORDER
-        assert "005930" in payload.title
-        assert "BUY" in payload.title
 
-    @pytest.mark.asyncio
-    async def test_notify_order_rejected(self):
-        with patch.object(NotificationService, "send", new_callable=AsyncMock) as mock:
-            await notify_order_rejected("user1", "005930", "buy", "insufficient cash")
+# ── Notification API Tests ──
 
-        payload = mock.call_args[0][0]
-        assert "Rejected" in payload.title
-        assert "insufficient cash" in payload.message
 
-    @pytest.mark.asyncio
-    async def test_notify_agent_started(self):
-        with patch.object(NotificationService, "send", new_callable=AsyncMock) as mock:
-            await notify_agent_started("user1", "session-1", "full_cycle")
+_API_USER_ID = uuid.UUID("11111111-1111-1111-1111-111111111111")
 
-        payload = mock.call_args[0][0]
-        assert payload.category == NotificationCategory.AGENT
-        assert "Started" in payload.title
 
-    @pytest.mark.asyncio
-    async def test_notify_agent_completed(self):
-        with patch.object(NotificationService, "send", new_callable=AsyncMock) as mock:
-            await notify_agent_completed("user1", "session-1", 3)
+class FakeUser:
+    id = _API_USER_ID
+    email = "test@test.com"
 
-        payload = mock.call_args[0][0]
-        assert "Completed" in payload.title
-        assert "3" in payload.message
 
-    @pytest.mark.asyncio
-    async def test_notify_agent_error_sends_email(self):
-        with patch.object(NotificationService, "send", new_callable=AsyncMock) as mock:
-            await notify_agent_error("user1", "session-1", "timeout")
+def _make_fake_notif():
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=_API_USER_ID,
+        category="order",
+        title="Test Notification",
+        message="Test message",
+        is_read=False,
+        data=None,
+        link=None,
+        created_at=SimpleNamespace(isoformat=lambda: "2024-01-01T00:00:00"),
+    )
 
-        payload = mock.call_args[0][0]
-        assert payload.send_email is True
-        assert "Error" in payload.title
 
-    @pytest.mark.asyncio
-    async def test_notify_pending_approval_sends_email(self):
-        with patch.object(NotificationService, "send", new_callable=AsyncMock) as mock:
-            await notify_pending_approval("user1", "session-1", 3, 15_000_000)
+@dataclass
+class FakePreference:
+    in_app_enabled: bool = True
+    email_enabled: bool = False
+    trade_alerts: bool = True
+    agent_alerts: bool = True
+    order_alerts: bool = True
+    position_alerts: bool = True
+    system_alerts: bool = True
+    email_address: str | None = None
 
-        payload = mock.call_args[0][0]
-        assert payload.send_email is True
-        assert payload.category == NotificationCategory.TRADE
-        assert "Pending" in payload.title
 
-    @pytest.mark.asyncio
-    async def test_notify_pnl_alert(self):
-        with patch.object(NotificationService, "send", new_callable=AsyncMock) as mock:
-            await notify_pnl_alert("user1", "005930", -500000, -5.2)
+class UniversalResult:
+    """Mock result supporting .scalars().all(), .scalar_one_or_none() and .scalar()."""
 
-        payload = mock.call_args[0][0]
-        assert payload.category == NotificationCategory.ALERT
-        assert "005930" in payload.title
-        assert "-5.2%" in payload.title
+    def __init__(self, items, scalar_val=None, single=None):
+        self._scalars = MagicMock()
+        self._scalars.all.return_value = items
+        self._scalar_val = scalar_val
+        self._single = single
 
+    def scalars(self):
+        return self._scalars
 
-# ── Notification API Tests ──
+    def scalar(self):
+        return self._scalar_val
 
+    def scalar_one_or_none(self):
+        return self._single
 
-@pytest.mark.asyncio
-class TestNotificationAPI:
-    @pytest.fixture
-    async def client(self):
-        from httpx import AsyncClient, ASGITransport
-        from app.main import create_app
-        from app.db.session import get_db
-        from app.api.v1.deps import get_current_user
-
-        app = create_app()
-        user_id = uuid.UUID("11111111-1111-1111-1111-111111111111")
-
-        class FakeUser:
-            id = user_id
-            email = "test@test.com"
-
-        # Mock notifications in DB
-        fake_notif = MagicMock()
-        fake_notif.id = uuid.uuid4()
-        fake_notif.user_id = user_id
-        fake_notif.category = "order"
-        fake_notif.title = "Test Notification"
-        fake_notif.message = "Test message"
-        fake_notif.is_read = False
-        fake_notif.data = None
-        fake_notif.link = None
-        fake_notif.created_at = MagicMock()
-        fake_notif.created_at.isoformat.return_value = "2024-01-01T00:00:00"
-
-        # Scalars mock for notification list
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = [fake_notif]
-
-        mock_result_list = MagicMock()
-        mock_result_list.scalars.return_value = mock_scalars
-
-        mock_result_count = MagicMock()
-        mock_result_count.scalar.return_value = 1
-
-        # Fake preference object
-        fake_pref = MagicMock()
-        fake_pref.in_app_enabled = True
-        fake_pref.email_enabled = False
-        fake_pref.trade_alerts = True
-        fake_pref.agent_alerts = True
-        fake_pref.order_alerts = True
-        fake_pref.position_alerts = True
-        fake_pref.system_alerts = True
-        fake_pref.email_address = None
-
-        # Universal mock result that supports both .scalars().all() and .scalar_one_or_none() and .scalar()
-        class UniversalResult:
-            def __init__(self, items, scalar_val=None, single=None):
-                self._items = items
-                self._scalar_val = scalar_val
-                self._single = single
-
-            def scalars(self):
-                m = MagicMock()
-                m.all.return_value = self._items
-                return m
-
-            def scalar(self):
-                return self._scalar_val
-
-            def scalar_one_or_none(self):
-                return self._single
 
+@pytest.mark.asyncio(loop_scope="module")
+class TestNotificationAPI:
+    @pytest_asyncio.fixture(loop_scope="module")
+    async def client(self, asgi_app, asgi_transport):
+        fake_notif = _make_fake_notif()
+        # Built per test: PUT /preferences mutates the object in place.
+        fake_pref = FakePreference()
+        pref_result = UniversalResult([], scalar_val=None, single=fake_pref)
+        count_result = UniversalResult([], scalar_val=1, single=None)
+        notif_result = UniversalResult([fake_notif], scalar_val=None, single=fake_notif)
         mock_db = AsyncMock()
 
-        async def dynamic_execute(*args, **kwargs):
-            # Inspect the query to return appropriate result
-            query_str = str(args[0]) if args else ""
-            if "notification_preferences" in query_str:
-                return UniversalResult([], scalar_val=None, single=fake_pref)
-            elif "COUNT" in query_str or "count" in query_str:
-                return UniversalResult([], scalar_val=1, single=None)
-            else:
-                return UniversalResult([fake_notif], scalar_val=None, single=fake_notif)
+        async def dynamic_execute(stmt, *args, **kwargs):
+            # Route on the statement structure; str(stmt) would compile the SQL
+            if isinstance(stmt, Select):
+                if stmt.get_final_froms()[0].name == "notification_preferences":
+                    return pref_result
+                if any(getattr(c, "name", None) == "count" for c in stmt.selected_columns):
+                    return count_result
+            return notif_result
 
         mock_db.execute = dynamic_execute
         mock_db.add = MagicMock()
@@ -342,11 +355,11 @@ class TestNotificationAPI:
         async def override_user():
             return FakeUser()
 
-        app.dependency_overrides[get_db] = override_db
-        app.dependency_overrides[get_current_user] = override_user
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as c:
+        asgi_app.dependency_overrides[get_db] = override_db
+        asgi_app.dependency_overrides[get_current_user] = override_user
+        async with AsyncClient(transport=asgi_transport, base_url="http://test") as c:
             yield c
+        asgi_app.dependency_overrides.clear()
 
     async def test_list_notifications(self, client):
         res = await client.get("/api/v1/notifications")
@@ -380,3 +393,7 @@ class TestNotificationAPI:
             "trade_alerts": False,
         })
         assert res.status_code == 200
+        data = res.json()
+        assert data["email_enabled"] is True
+        assert data["trade_alerts"] is False
+        assert data["agent_alerts"] is True
@@ -1,10 +1,56 @@
 """Tests for paper trading simulation engine and API."""
 
+import uuid
+from dataclasses import dataclass
+from unittest.mock import patch
+
 import pytest
+from httpx import AsyncClient
+
+from app.api.v1.deps import get_current_user
+from app.api.v1.paper import (
+    CreateSessionRequest,
+    PaperOrderRequest,
+    PriceUpdateRequest,
+    create_session,
+    get_session_summary,
+    place_paper_order,
+    update_prices,
+)
 from app.simulation.paper_broker import PaperBroker, FillModel, PaperOrder, PaperPosition, PaperTrade
 from app.simulation.paper_portfolio import PaperPortfolio, PaperSession
 
 
+@dataclass(frozen=True, slots=True)
+class _FakeUser:
+    id: str
+    email: str = "test@test.com"
+
+
+@pytest.fixture
+def user_id():
+    """Fresh owner id per test; sessions in PaperPortfolio's process-wide store
+    are partitioned by user, so tests never see each other's sessions."""
+    return str(uuid.uuid4())
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _clear_portfolio_after_module():
+    """Reset the shared store once on the way out, and only if we touched it."""
+    before = len(PaperPortfolio._sessions)
+    yield
+    if len(PaperPortfolio._sessions) != before:
+        PaperPortfolio.reset()
+
+
+def _round_trips(broker, trades):
+    """Buy then sell each ``(code, qty, buy_price, sell_price)`` at market."""
+    place = broker.place_order
+    for code, qty, buy_price, sell_price in trades:
+        place(code, "buy", qty, current_price=buy_price)
+        place(code, "sell", qty, current_price=sell_price)
+
+
 # ── PaperBroker Tests ──
 
 
@@ -43,12 +89,6 @@ class TestPaperBrokerBuy:
         assert broker.positions["005930"].quantity == 10
         assert broker.positions["005930"].avg_cost_price == 70000
 
-    def test_buy_insufficient_cash(self):
-        broker = PaperBroker(initial_cash=500_000, fill_model=FillModel.IMMEDIATE)
-        order = broker.place_order("005930", "buy", 100, current_price=70000)
-        assert order.status == "rejected"
-        assert broker.cash == 500_000  # unchanged
-
     def test_buy_averaging_up(self):
         broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
         broker.place_order("005930", "buy", 10, current_price=70000)
@@ -58,16 +98,11 @@ class TestPaperBrokerBuy:
         assert pos.quantity == 20
         assert pos.avg_cost_price == 75000  # (70k*10 + 80k*10) / 20
 
-    def test_buy_realistic_slippage(self):
-        broker = PaperBroker(
-            initial_cash=100_000_000,
-            fill_model=FillModel.REALISTIC,
-            slippage_bps_range=(10.0, 10.0),  # Fixed 10 bps
-        )
-        order = broker.place_order("005930", "buy", 10, current_price=100000)
-        assert order.status == "filled"
-        # 10 bps = 0.1%, so fill should be ~100100
-        assert order.avg_fill_price == pytest.approx(100100, rel=1e-6)
+    def test_immediate_fill_never_samples_slippage(self):
+        broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
+        with patch("app.simulation.paper_broker.random.uniform") as uniform:
+            broker.place_order("005930", "buy", 10, current_price=70000)
+        uniform.assert_not_called()
 
 
 class TestPaperBrokerSell:
@@ -94,50 +129,8 @@ class TestPaperBrokerSell:
         assert broker.positions["005930"].quantity == 5
         assert broker.cash == 100_000_000 - 700_000 + 375_000
 
-    def test_sell_without_position(self):
-        broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
-        order = broker.place_order("005930", "sell", 10, current_price=70000)
-        # Should fill but warn (short selling)
-        assert order.status == "filled"
-
-    def test_sell_realistic_slippage(self):
-        broker = PaperBroker(
-            initial_cash=100_000_000,
-            fill_model=FillModel.REALISTIC,
-            slippage_bps_range=(10.0, 10.0),
-        )
-        broker.place_order("005930", "buy", 10, current_price=100000)
-        order = broker.place_order("005930", "sell", 10, current_price=100000)
-        # Sell slippage: price * (1 - 0.001) = 99900
-        assert order.avg_fill_price == pytest.approx(99900, rel=1e-6)
-
 
 class TestPaperBrokerLimitOrders:
-    def test_limit_buy_below_market(self):
-        broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
-        order = broker.place_order(
-            "005930", "buy", 10, current_price=70000,
-            order_type="limit", limit_price=65000,
-        )
-        assert order.status == "pending"  # Price too high
-
-    def test_limit_buy_at_or_below_limit(self):
-        broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
-        order = broker.place_order(
-            "005930", "buy", 10, current_price=60000,
-            order_type="limit", limit_price=65000,
-        )
-        assert order.status == "filled"
-
-    def test_limit_sell_above_market(self):
-        broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
-        broker.place_order("005930", "buy", 10, current_price=70000)
-        order = broker.place_order(
-            "005930", "sell", 10, current_price=70000,
-            order_type="limit", limit_price=75000,
-        )
-        assert order.status == "pending"  # Price too low
-
     def test_try_fill_pending(self):
         broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
         broker.place_order(
@@ -152,6 +145,66 @@ class TestPaperBrokerLimitOrders:
         assert broker.positions["005930"].quantity == 10
 
 
+_BUY_10_AT_70K = {"stock_code": "005930", "side": "buy", "quantity": 10, "current_price": 70000}
+_FIXED_10BPS = {"fill_model": FillModel.REALISTIC, "slippage_bps_range": (10.0, 10.0)}
+
+
+class TestPaperBrokerOrderScenarios:
+    """Single-order outcomes; ``setup`` orders are placed first."""
+
+    @pytest.mark.parametrize("case", [
+        pytest.param({
+            "ctor": {"initial_cash": 500_000},
+            "order": {"stock_code": "005930", "side": "buy", "quantity": 100, "current_price": 70000},
+            "status": "rejected",
+            "cash": 500_000,  # unchanged
+        }, id="buy_insufficient_cash"),
+        pytest.param({
+            "order": {"stock_code": "005930", "side": "sell", "quantity": 10, "current_price": 70000},
+            "status": "filled",  # fills but warns (short selling)
+        }, id="sell_without_position"),
+        pytest.param({
+            "ctor": _FIXED_10BPS,
+            "order": {"stock_code": "005930", "side": "buy", "quantity": 10, "current_price": 100000},
+            "status": "filled",
+            "fill_price": 100100,  # 10 bps = 0.1% above
+        }, id="buy_realistic_slippage"),
+        pytest.param({
+            "ctor": _FIXED_10BPS,
+            "setup": [{"stock_code": "005930", "side": "buy", "quantity": 10, "current_price": 100000}],
+            "order": {"stock_code": "005930", "side": "sell", "quantity": 10, "current_price": 100000},
+            "status": "filled",
+            "fill_price": 99900,  # price * (1 - 0.001)
+        }, id="sell_realistic_slippage"),
+        pytest.param({
+            "order": {**_BUY_10_AT_70K, "order_type": "limit", "limit_price": 65000},
+            "status": "pending",  # price too high
+        }, id="limit_buy_below_market"),
+        pytest.param({
+            "order": {**_BUY_10_AT_70K, "current_price": 60000, "order_type": "limit", "limit_price": 65000},
+            "status": "filled",
+        }, id="limit_buy_at_or_below_limit"),
+        pytest.param({
+            "setup": [_BUY_10_AT_70K],
+            "order": {**_BUY_10_AT_70K, "side": "sell", "order_type": "limit", "limit_price": 75000},
+            "status": "pending",  # price too low
+        }, id="limit_sell_above_market"),
+    ])
+    def test_place_order_scenarios(self, case):
+        ctor = {"initial_cash": 100_000_000, "fill_model": FillModel.IMMEDIATE, **case.get("ctor", {})}
+        broker = PaperBroker(**ctor)
+        for setup_order in case.get("setup", []):
+            broker.place_order(**setup_order)
+
+        order = broker.place_order(**case["order"])
+
+        assert order.status == case["status"]
+        if "fill_price" in case:
+            assert order.avg_fill_price == pytest.approx(case["fill_price"], rel=1e-6)
+        if "cash" in case:
+            assert broker.cash == case["cash"]
+
+
 class TestPaperBrokerPriceUpdates:
     def test_update_prices(self):
         broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
@@ -187,12 +240,10 @@ class TestPaperBrokerStats:
 
     def test_stats_with_trades(self):
         broker = PaperBroker(initial_cash=100_000_000, fill_model=FillModel.IMMEDIATE)
-        # Winning trade
-        broker.place_order("005930", "buy", 10, current_price=70000)
-        broker.place_order("005930", "sell", 10, current_price=80000)
-        # Losing trade
-        broker.place_order("000660", "buy", 10, current_price=150000)
-        broker.place_order("000660", "sell", 10, current_price=140000)
+        _round_trips(broker, [
+            ("005930", 10, 70000, 80000),  # Winning trade
+            ("000660", 10, 150000, 140000),  # Losing trade
+        ])
 
         stats = broker.get_stats()
         assert stats["total_trades"] == 2
@@ -206,10 +257,10 @@ class TestPaperBrokerStats:
     def test_stats_max_drawdown(self):
         broker = PaperBroker(initial_cash=10_000_000, fill_model=FillModel.IMMEDIATE)
         # Win then lose big
-        broker.place_order("A", "buy", 100, current_price=10000, stock_name="A")
-        broker.place_order("A", "sell", 100, current_price=12000)  # +200k
-        broker.place_order("B", "buy", 100, current_price=10000, stock_name="B")
-        broker.place_order("B", "sell", 100, current_price=7000)  # -300k
+        _round_trips(broker, [
+            ("A", 100, 10000, 12000),  # +200k
+            ("B", 100, 10000, 7000),  # -300k
+        ])
 
         stats = broker.get_stats()
         assert stats["max_drawdown_pct"] > 0
@@ -219,37 +270,34 @@ class TestPaperBrokerStats:
 
 
 class TestPaperPortfolio:
-    def setup_method(self):
-        PaperPortfolio.reset()
-
-    def test_create_session(self):
+    def test_create_session(self, user_id):
         session = PaperPortfolio.create_session(
-            user_id="user1", name="Test", initial_cash=50_000_000
+            user_id=user_id, name="Test", initial_cash=50_000_000
         )
-        assert session.user_id == "user1"
+        assert session.user_id == user_id
         assert session.name == "Test"
         assert session.status == "active"
         assert session.initial_cash == 50_000_000
         assert PaperPortfolio.get_session(session.id) is session
 
-    def test_list_sessions(self):
-        PaperPortfolio.create_session(user_id="user1", name="Session A")
-        PaperPortfolio.create_session(user_id="user1", name="Session B")
-        PaperPortfolio.create_session(user_id="user2", name="Session C")
+    def test_list_sessions(self, user_id):
+        PaperPortfolio.create_session(user_id=user_id, name="Session A")
+        PaperPortfolio.create_session(user_id=user_id, name="Session B")
+        PaperPortfolio.create_session(user_id=f"{user_id}-other", name="Session C")
 
-        u1_sessions = PaperPortfolio.list_sessions("user1")
+        u1_sessions = PaperPortfolio.list_sessions(user_id)
         assert len(u1_sessions) == 2
-        u2_sessions = PaperPortfolio.list_sessions("user2")
+        u2_sessions = PaperPortfolio.list_sessions(f"{user_id}-other")
         assert len(u2_sessions) == 1
 
-    def test_get_broker(self):
-        session = PaperPortfolio.create_session(user_id="user1")
+    def test_get_broker(self, user_id):
+        session = PaperPortfolio.create_session(user_id=user_id)
         broker = PaperPortfolio.get_broker(session.id)
         assert broker is not None
         assert broker.initial_cash == 100_000_000
 
-    def test_stop_session(self):
-        session = PaperPortfolio.create_session(user_id="user1")
+    def test_stop_session(self, user_id):
+        session = PaperPortfolio.create_session(user_id=user_id)
         stopped = PaperPortfolio.stop_session(session.id)
         assert stopped.status == "completed"
         assert stopped.ended_at is not None
@@ -258,8 +306,8 @@ class TestPaperPortfolio:
         result = PaperPortfolio.stop_session("nonexistent")
         assert result is None
 
-    def test_session_summary_empty(self):
-        session = PaperPortfolio.create_session(user_id="user1")
+    def test_session_summary_empty(self, user_id):
+        session = PaperPortfolio.create_session(user_id=user_id)
         summary = PaperPortfolio.get_session_summary(session.id)
         assert summary is not None
         assert summary["stats"]["total_trades"] == 0
@@ -268,9 +316,10 @@ class TestPaperPortfolio:
         assert summary["trades"] == []
         assert len(summary["equity_curve"]) == 1
 
-    def test_session_summary_with_trades(self):
+    def test_session_summary_with_trades(self, user_id):
+        """Partial exit: one open position, one closed trade, one equity step."""
         session = PaperPortfolio.create_session(
-            user_id="user1", fill_model="immediate"
+            user_id=user_id, initial_cash=10_000_000, fill_model="immediate"
         )
         broker = PaperPortfolio.get_broker(session.id)
         broker.place_order("005930", "buy", 10, current_price=70000, stock_name="삼성전자")
@@ -284,35 +333,26 @@ class TestPaperPortfolio:
         assert len(summary["trades"]) == 1
         assert summary["trades"][0]["pnl"] == 25000  # (75k-70k)*5
 
-    def test_session_summary_equity_curve(self):
-        session = PaperPortfolio.create_session(
-            user_id="user1", initial_cash=10_000_000, fill_model="immediate"
-        )
-        broker = PaperPortfolio.get_broker(session.id)
-        broker.place_order("A", "buy", 100, current_price=10000, stock_name="A")
-        broker.place_order("A", "sell", 100, current_price=11000)
-
-        summary = PaperPortfolio.get_session_summary(session.id)
         curve = summary["equity_curve"]
         assert len(curve) == 2
         assert curve[0]["value"] == 10_000_000
-        assert curve[1]["value"] == 10_100_000  # +100k pnl
+        assert curve[1]["value"] == 10_025_000  # + realized pnl
 
-    def test_reset(self):
-        PaperPortfolio.create_session(user_id="user1")
+    def test_reset(self, user_id):
+        PaperPortfolio.create_session(user_id=user_id)
         PaperPortfolio.reset()
-        assert PaperPortfolio.list_sessions("user1") == []
+        assert PaperPortfolio.list_sessions(user_id) == []
 
-    def test_fill_model_realistic(self):
+    def test_fill_model_realistic(self, user_id):
         session = PaperPortfolio.create_session(
-            user_id="user1", fill_model="realistic"
+            user_id=user_id, fill_model="realistic"
         )
         broker = PaperPortfolio.get_broker(session.id)
         assert broker.fill_model == FillModel.REALISTIC
 
-    def test_fill_model_immediate(self):
+    def test_fill_model_immediate(self, user_id):
         session = PaperPortfolio.create_session(
-            user_id="user1", fill_model="immediate"
+            user_id=user_id, fill_model="immediate"
         )
         broker = PaperPortfolio.get_broker(session.id)
         assert broker.fill_model == FillModel.IMMEDIATE
@@ -323,34 +363,29 @@ class TestPaperPortfolio:
 
 @pytest.mark.asyncio
 class TestPaperAPI:
-    """Test paper trading API endpoints via httpx."""
+    """Test paper trading API endpoints.
 
-    @pytest.fixture(autouse=True)
-    def reset_state(self):
-        PaperPortfolio.reset()
-        yield
-        PaperPortfolio.reset()
+    Routing, validation and serialization go through httpx; tests that only
+    check trading behaviour call the route handlers directly.
+    """
 
     @pytest.fixture
-    async def client(self):
-        import uuid
-        from httpx import AsyncClient, ASGITransport
-        from app.main import create_app
-        from app.api.v1.deps import get_current_user
+    def fake_user(self, user_id):
+        return _FakeUser(id=user_id)
 
-        app = create_app()
-
-        class FakeUser:
-            id = uuid.UUID("11111111-1111-1111-1111-111111111111")
-            email = "test@test.com"
-
-        async def override_user():
-            return FakeUser()
-
-        app.dependency_overrides[get_current_user] = override_user
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as c:
+    @pytest.fixture
+    async def client(self, asgi_app, asgi_transport, fake_user):
+        asgi_app.dependency_overrides[get_current_user] = lambda: fake_user
+        async with AsyncClient(transport=asgi_transport, base_url="http://test") as c:
             yield c
+        asgi_app.dependency_overrides.clear()
+
+    @pytest.fixture
+    def make_session(self, user_id):
+        """Create a session for the fake user directly, bypassing HTTP."""
+        def _make(**kwargs):
+            return PaperPortfolio.create_session(user_id=user_id, **kwargs).id
+        return _make
 
     async def test_create_session(self, client):
         res = await client.post("/api/v1/paper/sessions", json={
@@ -362,16 +397,15 @@ class TestPaperAPI:
         assert data["status"] == "active"
         assert data["initial_cash"] == 50000000
 
-    async def test_list_sessions(self, client):
-        await client.post("/api/v1/paper/sessions", json={"name": "S1"})
-        await client.post("/api/v1/paper/sessions", json={"name": "S2"})
+    async def test_list_sessions(self, client, make_session):
+        make_session(name="S1")
+        make_session(name="S2")
         res = await client.get("/api/v1/paper/sessions")
         assert res.status_code == 200
         assert len(res.json()) == 2
 
-    async def test_get_session_summary(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={"name": "Test"})
-        sid = create.json()["id"]
+    async def test_get_session_summary(self, client, make_session):
+        sid = make_session(name="Test")
         res = await client.get(f"/api/v1/paper/sessions/{sid}")
         assert res.status_code == 200
         data = res.json()
@@ -383,25 +417,20 @@ class TestPaperAPI:
         res = await client.get("/api/v1/paper/sessions/nonexistent")
         assert res.status_code == 404
 
-    async def test_stop_session(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={"name": "Test"})
-        sid = create.json()["id"]
+    async def test_stop_session(self, client, make_session):
+        sid = make_session(name="Test")
         res = await client.post(f"/api/v1/paper/sessions/{sid}/stop")
         assert res.status_code == 200
         assert res.json()["status"] == "completed"
 
-    async def test_stop_already_stopped(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={"name": "Test"})
-        sid = create.json()["id"]
+    async def test_stop_already_stopped(self, client, make_session):
+        sid = make_session(name="Test")
         await client.post(f"/api/v1/paper/sessions/{sid}/stop")
         res = await client.post(f"/api/v1/paper/sessions/{sid}/stop")
         assert res.status_code == 400
 
-    async def test_place_order_buy(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={
-            "name": "Test", "fill_model": "immediate"
-        })
-        sid = create.json()["id"]
+    async def test_place_order_buy(self, client, make_session):
+        sid = make_session(name="Test", fill_model="immediate")
         res = await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
             "stock_code": "005930", "stock_name": "삼성전자",
             "side": "buy", "quantity": 10, "current_price": 70000,
@@ -412,77 +441,62 @@ class TestPaperAPI:
         assert data["filled_quantity"] == 10
         assert data["avg_fill_price"] == 70000
 
-    async def test_place_order_sell(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={
-            "name": "Test", "fill_model": "immediate"
-        })
-        sid = create.json()["id"]
-        await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
-            "stock_code": "005930", "side": "buy", "quantity": 10, "current_price": 70000,
-        })
-        res = await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
-            "stock_code": "005930", "side": "sell", "quantity": 10, "current_price": 75000,
-        })
-        assert res.status_code == 200
-        assert res.json()["status"] == "filled"
+    async def test_place_order_sell(self, fake_user, make_session):
+        sid = make_session(name="Test", fill_model="immediate")
+        await place_paper_order(sid, PaperOrderRequest(
+            stock_code="005930", side="buy", quantity=10, current_price=70000,
+        ), user=fake_user)
+        data = await place_paper_order(sid, PaperOrderRequest(
+            stock_code="005930", side="sell", quantity=10, current_price=75000,
+        ), user=fake_user)
+        assert data["status"] == "filled"
 
-    async def test_place_order_invalid_side(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={"name": "Test"})
-        sid = create.json()["id"]
+    async def test_place_order_invalid_side(self, client, make_session):
+        sid = make_session(name="Test")
         res = await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
             "stock_code": "005930", "side": "invalid", "quantity": 10, "current_price": 70000,
         })
         assert res.status_code == 400
 
-    async def test_place_order_on_stopped_session(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={"name": "Test"})
-        sid = create.json()["id"]
+    async def test_place_order_on_stopped_session(self, client, make_session):
+        sid = make_session(name="Test")
         await client.post(f"/api/v1/paper/sessions/{sid}/stop")
         res = await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
             "stock_code": "005930", "side": "buy", "quantity": 10, "current_price": 70000,
         })
         assert res.status_code == 400
 
-    async def test_update_prices(self, client):
-        create = await client.post("/api/v1/paper/sessions", json={
-            "name": "Test", "fill_model": "immediate"
-        })
-        sid = create.json()["id"]
-        await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
-            "stock_code": "005930", "side": "buy", "quantity": 10, "current_price": 70000,
-        })
-        res = await client.post(f"/api/v1/paper/sessions/{sid}/prices", json={
-            "prices": {"005930": 75000}
-        })
-        assert res.status_code == 200
-        assert res.json()["prices_updated"] == 1
+    async def test_update_prices(self, fake_user, make_session):
+        sid = make_session(name="Test", fill_model="immediate")
+        await place_paper_order(sid, PaperOrderRequest(
+            stock_code="005930", side="buy", quantity=10, current_price=70000,
+        ), user=fake_user)
+        data = await update_prices(sid, PriceUpdateRequest(prices={"005930": 75000}), user=fake_user)
+        assert data["prices_updated"] == 1
 
-    async def test_full_round_trip(self, client):
+    async def test_full_round_trip(self, fake_user):
         """Full session: create → buy → update prices → sell → check summary."""
-        create = await client.post("/api/v1/paper/sessions", json={
-            "name": "Full Test", "initial_cash": 10000000, "fill_model": "immediate"
-        })
-        sid = create.json()["id"]
+        created = await create_session(CreateSessionRequest(
+            name="Full Test", initial_cash=10000000, fill_model="immediate",
+        ), user=fake_user)
+        sid = created["id"]
 
         # Buy
-        await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
-            "stock_code": "005930", "stock_name": "삼성전자",
-            "side": "buy", "quantity": 100, "current_price": 70000,
-        })
+        await place_paper_order(sid, PaperOrderRequest(
+            stock_code="005930", stock_name="삼성전자",
+            side="buy", quantity=100, current_price=70000,
+        ), user=fake_user)
 
         # Update prices
-        await client.post(f"/api/v1/paper/sessions/{sid}/prices", json={
-            "prices": {"005930": 75000}
-        })
+        await update_prices(sid, PriceUpdateRequest(prices={"005930": 75000}), user=fake_user)
 
         # Sell
-        await client.post(f"/api/v1/paper/sessions/{sid}/order", json={
-            "stock_code": "005930", "side": "sell", "quantity": 100, "current_price": 75000,
-        })
+        await place_paper_order(sid, PaperOrderRequest(
+            stock_code="005930", side="sell", quantity=100, current_price=75000,
+        ), user=fake_user)
 
         # Check summary
-        res = await client.get(f"/api/v1/paper/sessions/{sid}")
-        data = res.json()
+        data = await get_session_summary(sid, user=fake_user)
         assert data["stats"]["total_trades"] == 1
         assert data["stats"]["realized_pnl"] == 500000  # (75k-70k)*100
         assert data["stats"]["win_rate"] == 100.0
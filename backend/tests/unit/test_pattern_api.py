@@ -1,9 +1,19 @@
 """Tests for Pattern API endpoints."""
 
 import uuid
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from fastapi import HTTPException
+
+from app.api.v1.patterns import (
+    PatternDiscoverRequest,
+    activate_pattern,
+    discover_pattern,
+    get_pattern,
+    list_patterns,
+)
 
 
 class MockResult:
@@ -20,6 +30,13 @@ class MockResult:
         return self._items[0] if self._items else None
 
 
+EMPTY = MockResult([])
+
+
+def result_for(pattern):
+    return MockResult([pattern])
+
+
 @pytest.fixture
 def test_user():
     user = MagicMock()
@@ -35,30 +52,29 @@ def mock_db():
     return db
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_pattern():
-    p = MagicMock()
-    p.id = uuid.uuid4()
-    p.name = "RSI Reversal Pattern"
-    p.description = "Rising from RSI oversold"
-    p.pattern_type = "rise_5pct_5day"
-    p.feature_importance = {"rsi_14": 0.35, "macd_histogram": 0.2}
-    p.model_metrics = {"accuracy": 0.72, "f1": 0.65}
-    p.rule_description = "RSI가 40 이하에서 반등 후 MACD 골든크로스"
-    p.rule_config = {"rules": [{"factor": "rsi_14", "operator": "<=", "threshold": 40}]}
-    p.validation_results = {"walk_forward_sharpe": 1.2}
-    p.status = "validated"
-    p.sample_count = 500
-    p.event_count = 45
-    return p
+    """Shared read-only pattern; tests that mutate it go through monkeypatch."""
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        name="RSI Reversal Pattern",
+        description="Rising from RSI oversold",
+        pattern_type="rise_5pct_5day",
+        feature_importance={"rsi_14": 0.35, "macd_histogram": 0.2},
+        model_metrics={"accuracy": 0.72, "f1": 0.65},
+        rule_description="RSI가 40 이하에서 반등 후 MACD 골든크로스",
+        rule_config={"rules": [{"factor": "rsi_14", "operator": "<=", "threshold": 40}]},
+        validation_results={"walk_forward_sharpe": 1.2},
+        status="validated",
+        sample_count=500,
+        event_count=45,
+    )
 
 
 class TestListPatterns:
     @pytest.mark.asyncio
     async def test_returns_list(self, test_user, mock_db, mock_pattern):
-        from app.api.v1.patterns import list_patterns
-
-        mock_db.execute = AsyncMock(return_value=MockResult([mock_pattern]))
+        mock_db.execute.return_value = result_for(mock_pattern)
 
         result = await list_patterns(status=None, limit=20, db=mock_db, user=test_user)
         assert len(result) == 1
@@ -67,9 +83,7 @@ class TestListPatterns:
 
     @pytest.mark.asyncio
     async def test_empty_list(self, test_user, mock_db):
-        from app.api.v1.patterns import list_patterns
-
-        mock_db.execute = AsyncMock(return_value=MockResult([]))
+        mock_db.execute.return_value = EMPTY
         result = await list_patterns(status=None, limit=20, db=mock_db, user=test_user)
         assert result == []
 
@@ -77,9 +91,7 @@ class TestListPatterns:
 class TestGetPattern:
     @pytest.mark.asyncio
     async def test_found(self, test_user, mock_db, mock_pattern):
-        from app.api.v1.patterns import get_pattern
-
-        mock_db.execute = AsyncMock(return_value=MockResult([mock_pattern]))
+        mock_db.execute.return_value = result_for(mock_pattern)
 
         result = await get_pattern(
             pattern_id=str(mock_pattern.id), db=mock_db, user=test_user
@@ -89,10 +101,7 @@ class TestGetPattern:
 
     @pytest.mark.asyncio
     async def test_not_found(self, test_user, mock_db):
-        from app.api.v1.patterns import get_pattern
-        from fastapi import HTTPException
-
-        mock_db.execute = AsyncMock(return_value=MockResult([]))
+        mock_db.execute.return_value = EMPTY
 
         with pytest.raises(HTTPException) as exc_info:
             await get_pattern(
@@ -104,8 +113,6 @@ class TestGetPattern:
 class TestDiscoverPattern:
     @pytest.mark.asyncio
     async def test_queues_discovery(self, test_user):
-        from app.api.v1.patterns import discover_pattern, PatternDiscoverRequest
-
         request = PatternDiscoverRequest(
             pattern_type="rise_5pct_5day",
             threshold_pct=5.0,
@@ -117,11 +124,10 @@ class TestDiscoverPattern:
 
 class TestActivatePattern:
     @pytest.mark.asyncio
-    async def test_activate_validated(self, test_user, mock_db, mock_pattern):
-        from app.api.v1.patterns import activate_pattern
-
-        mock_pattern.status = "validated"
-        mock_db.execute = AsyncMock(return_value=MockResult([mock_pattern]))
+    async def test_activate_validated(self, test_user, mock_db, mock_pattern, monkeypatch):
+        # monkeypatch restores the original status even after the handler flips it
+        monkeypatch.setattr(mock_pattern, "status", "validated")
+        mock_db.execute.return_value = result_for(mock_pattern)
 
         result = await activate_pattern(
             pattern_id=str(mock_pattern.id), db=mock_db, user=test_user
@@ -131,10 +137,7 @@ class TestActivatePattern:
 
     @pytest.mark.asyncio
     async def test_activate_not_found(self, test_user, mock_db):
-        from app.api.v1.patterns import activate_pattern
-        from fastapi import HTTPException
-
-        mock_db.execute = AsyncMock(return_value=MockResult([]))
+        mock_db.execute.return_value = EMPTY
 
         with pytest.raises(HTTPException) as exc_info:
             await activate_pattern(
@@ -143,12 +146,9 @@ class TestActivatePattern:
         assert exc_info.value.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_activate_invalid_status(self, test_user, mock_db, mock_pattern):
-        from app.api.v1.patterns import activate_pattern
-        from fastapi import HTTPException
-
-        mock_pattern.status = "deprecated"
-        mock_db.execute = AsyncMock(return_value=MockResult([mock_pattern]))
+    async def test_activate_invalid_status(self, test_user, mock_db, mock_pattern, monkeypatch):
+        monkeypatch.setattr(mock_pattern, "status", "deprecated")
+        mock_db.execute.return_value = result_for(mock_pattern)
 
         with pytest.raises(HTTPException) as exc_info:
             await activate_pattern(
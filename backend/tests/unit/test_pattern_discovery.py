@@ -14,18 +14,21 @@ from app.services.pattern_discovery import (
 )
 
 
+_EVENT_DAYS = (30, 60, 80)
+
+
 def _make_price_data(n=100, with_events=True):
     """Create synthetic price data with optional rise events."""
-    np.random.seed(42)
-    base = 50000
-    closes = [base]
-    for i in range(1, n):
-        # Normal random walk
-        change = np.random.randn() * 200
-        if with_events and i in [30, 60, 80]:
-            # Insert rise events: +6% over 3 days
-            change = closes[-1] * 0.025
-        closes.append(closes[-1] + change)
+    rng = np.random.default_rng(42)
+    # Normal random walk
+    changes = rng.standard_normal(n) * 200
+    changes[0] = 0.0
+    closes = 50000 + np.cumsum(changes)
+    if with_events:
+        for i in _EVENT_DAYS:
+            if i < n:
+                # Insert rise events: +2.5% of the prior close on that day
+                closes[i:] += closes[i - 1] * 0.025 - changes[i]
 
     dates = pd.date_range("2025-01-01", periods=n, freq="B")
     return pd.DataFrame({
@@ -34,10 +37,15 @@ def _make_price_data(n=100, with_events=True):
     })
 
 
+@pytest.fixture(scope="module")
+def price_data_100():
+    """Shared 100-bar series with events; tests only read it."""
+    return _make_price_data(100, with_events=True)
+
+
 class TestExtractRiseEvents:
-    def test_finds_events(self):
-        df = _make_price_data(100, with_events=True)
-        events = extract_rise_events(df, threshold_pct=3.0, window_days=5)
+    def test_finds_events(self, price_data_100):
+        events = extract_rise_events(price_data_100, threshold_pct=3.0, window_days=5)
         assert len(events) > 0
 
     def test_no_events_in_flat_data(self):
@@ -49,9 +57,8 @@ class TestExtractRiseEvents:
         events = extract_rise_events(df, threshold_pct=5.0, window_days=5)
         assert len(events) == 0
 
-    def test_event_has_required_fields(self):
-        df = _make_price_data(100, with_events=True)
-        events = extract_rise_events(df, threshold_pct=3.0, window_days=5)
+    def test_event_has_required_fields(self, price_data_100):
+        events = extract_rise_events(price_data_100, threshold_pct=3.0, window_days=5)
         if events:
             e = events[0]
             assert "index" in e
@@ -64,12 +71,22 @@ class TestExtractRiseEvents:
         df = pd.DataFrame({"date": ["2025-01-01"], "close": [50000]})
         assert extract_rise_events(df) == []
 
-    def test_threshold_filtering(self):
-        df = _make_price_data(100, with_events=True)
-        events_3 = extract_rise_events(df, threshold_pct=3.0)
-        events_10 = extract_rise_events(df, threshold_pct=10.0)
+    def test_threshold_filtering(self, price_data_100):
+        events_3 = extract_rise_events(price_data_100, threshold_pct=3.0)
+        events_10 = extract_rise_events(price_data_100, threshold_pct=10.0)
         assert len(events_3) >= len(events_10)
 
+    def test_future_max_covers_whole_window(self):
+        # Peak lands on the last day of the look-ahead window
+        df = pd.DataFrame({
+            "date": pd.date_range("2025-01-01", periods=8, freq="B"),
+            "close": [100, 99, 98, 97, 96, 110, 90, 90],
+        })
+        events = extract_rise_events(df, threshold_pct=5.0, window_days=5)
+        assert [e["index"] for e in events] == [0, 1, 2]  # last 5 rows have no full window
+        assert events[0]["future_close"] == 110
+        assert events[0]["return_pct"] == pytest.approx(10.0)
+
 
 class TestBuildFeatureMatrix:
     def test_builds_matrix(self):
@@ -120,12 +137,33 @@ class TestBuildFeatureMatrix:
         assert not np.any(np.isnan(X))
         assert not np.any(np.isinf(X))
 
+    def test_ragged_snapshots_fill_missing_with_zero(self):
+        snapshots = {
+            "0": {"rsi_14": 45.0, "macd": 100.0},
+            "1": {"rsi_14": 55.0},
+            "2": {"rsi_14": 30.0, "macd": 200.0, "extra": 1.0},
+        }
+        X, y, features = build_feature_matrix(
+            snapshots,
+            event_indices=[0],
+            non_event_indices=[1, 2],
+        )
+        assert features == ["macd", "rsi_14"]
+        np.testing.assert_array_equal(
+            X, np.array([[100.0, 45.0], [0.0, 55.0], [200.0, 30.0]]),
+        )
+
+    def test_large_values_keep_full_precision(self):
+        snapshots = {"0": {"volume": 123456793.0}, "1": {"volume": 1.0}}
+        X, y, features = build_feature_matrix(snapshots, event_indices=[0], non_event_indices=[1])
+        assert X[0, 0] == 123456793.0
+
 
 class TestTrainClassifier:
     def test_trains_model(self):
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         n = 100
-        X = np.random.randn(n, 5)
+        X = rng.standard_normal((n, 5))
         # Make pattern: events have higher feature 0
         y = (X[:, 0] > 0.5).astype(int)
         features = ["f1", "f2", "f3", "f4", "f5"]
@@ -146,8 +184,8 @@ class TestTrainClassifier:
         assert result["metrics"]["accuracy"] == 0
 
     def test_feature_importance_sorted(self):
-        np.random.seed(42)
-        X = np.random.randn(200, 3)
+        rng = np.random.default_rng(42)
+        X = rng.standard_normal((200, 3))
         y = (X[:, 0] + X[:, 1] * 0.5 > 0).astype(int)
         features = ["main_signal", "weak_signal", "noise"]
 
@@ -202,3 +240,6 @@ class TestGradePattern:
 
     def test_missing_f1(self):
         assert grade_pattern({}) == "D"
+
+    def test_boundaries_inclusive(self):
+        assert [grade_pattern({"f1": f}) for f in (0.3, 0.5, 0.7)] == ["C", "B", "A"]
@@ -4,11 +4,19 @@ import pytest
 from app.services.pdf_report import (
     generate_portfolio_report,
     generate_backtest_report,
+    _build_styles,
     _format_won,
     _pnl_str,
 )
 
 
+class TestBuildStyles:
+    def test_styles_built_once(self):
+        assert _build_styles() is _build_styles()
+        with pytest.raises(TypeError):
+            _build_styles()["title"] = None  # shared across reports, so read-only
+
+
 class TestFormatWon:
     def test_billions(self):
         assert "억" in _format_won(150_000_000)
@@ -24,6 +32,16 @@ class TestFormatWon:
         result = _format_won(-200_000_000)
         assert "억" in result
 
+    @pytest.mark.parametrize("value, expected", [
+        (9_999, "₩9,999"),
+        (10_000, "₩1만"),
+        (99_999_999, "₩10,000만"),
+        (100_000_000, "₩1.0억"),
+        (-100_000_000, "₩-1.0억"),
+    ])
+    def test_band_boundaries(self, value, expected):
+        assert _format_won(value) == expected
+
 
 class TestPnlStr:
     def test_positive(self):
@@ -1,5 +1,8 @@
 """Tests for multi-strategy portfolio analysis: aggregator, correlation, attribution."""
 
+import copy
+import uuid
+
 import pytest
 import numpy as np
 
@@ -11,6 +14,7 @@ from app.analysis.portfolio.aggregator import (
 )
 from app.analysis.portfolio.correlation import StrategyCorrelation, CorrelationResult
 from app.analysis.portfolio.attribution import PerformanceAttribution, AttributionResult
+from app.agents.nodes.risk_manager import risk_manager_node
 
 
 # ── Helpers ──────────────────────────────────────────────────
@@ -67,6 +71,20 @@ class TestPortfolioAggregator:
         assert "s1" in result.conflicts[0]["long_strategies"]
         assert "s2" in result.conflicts[0]["short_strategies"]
 
+    def test_conflicts_listed_in_first_seen_order(self):
+        positions = [
+            _exp("s3", "Pairs", "000660", 10, 1_000_000, "short"),
+            _exp("s1", "Trend", "005930", 100, 5_000_000, "long"),
+            _exp("s1", "Trend", "000660", 20, 2_000_000, "long"),
+            _exp("s2", "Reversal", "005930", 50, 2_500_000, "short"),
+            _exp("s2", "Reversal", "035420", 50, 2_500_000, "short"),
+        ]
+        result = PortfolioAggregator.aggregate(positions)
+        assert [c["stock_code"] for c in result.conflicts] == ["000660", "005930"]
+        assert result.conflicts[0]["long_strategies"] == ["s1"]
+        assert result.conflicts[0]["short_strategies"] == ["s3"]
+        assert result.stock_exposures["000660"] == 1_000_000
+
     def test_high_concentration_warning(self):
         positions = [_exp("s1", "SMA", "005930", 100, 9_000_000)]
         result = PortfolioAggregator.aggregate(positions, total_capital=10_000_000)
@@ -102,6 +120,10 @@ class TestHHI:
     def test_zero_exposure(self):
         assert _calculate_hhi({}, 0) == 0
 
+    def test_net_short_uses_absolute_share(self):
+        # shares 75% and 25% → 5625 + 625
+        assert _calculate_hhi({"A": -3000, "B": 1000}, 4000) == pytest.approx(6250)
+
 
 # ── StrategyCorrelation tests ────────────────────────────────
 
@@ -137,26 +159,38 @@ class TestStrategyCorrelation:
         assert result.diversification_ratio >= 1.0
 
     def test_uncorrelated(self):
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         n = 500
         result = StrategyCorrelation.compute({
-            "s1": {"name": "A", "returns": np.random.randn(n).tolist()},
-            "s2": {"name": "B", "returns": np.random.randn(n).tolist()},
+            "s1": {"name": "A", "returns": rng.standard_normal(n)},
+            "s2": {"name": "B", "returns": rng.standard_normal(n)},
         })
         assert abs(result.avg_correlation) < 0.15  # Nearly zero for large N
 
     def test_three_strategies(self):
-        np.random.seed(123)
+        rng = np.random.default_rng(123)
         result = StrategyCorrelation.compute({
-            "s1": {"name": "A", "returns": np.random.randn(100).tolist()},
-            "s2": {"name": "B", "returns": np.random.randn(100).tolist()},
-            "s3": {"name": "C", "returns": np.random.randn(100).tolist()},
+            "s1": {"name": "A", "returns": rng.standard_normal(100)},
+            "s2": {"name": "B", "returns": rng.standard_normal(100)},
+            "s3": {"name": "C", "returns": rng.standard_normal(100)},
         })
         assert len(result.correlation_matrix) == 3
         assert len(result.correlation_matrix[0]) == 3
         assert result.max_pair is not None
         assert result.min_pair is not None
 
+    def test_accepts_ndarray_returns(self):
+        a = np.array([0.01, 0.02, -0.01, 0.03, -0.02])
+        from_arrays = StrategyCorrelation.compute({
+            "s1": {"name": "A", "returns": a},
+            "s2": {"name": "B", "returns": -a},
+        })
+        from_lists = StrategyCorrelation.compute({
+            "s1": {"name": "A", "returns": a.tolist()},
+            "s2": {"name": "B", "returns": (-a).tolist()},
+        })
+        assert from_arrays == from_lists
+
     def test_max_min_pair_identified(self):
         result = StrategyCorrelation.compute({
             "s1": {"name": "A", "returns": [1, 2, 3, 4, 5]},
@@ -211,7 +245,8 @@ class TestPerformanceAttribution:
             {"strategy_id": "s1", "strategy_name": "SMA", "stock_code": "035420", "pnl": -30000},
         ]
         result = PerformanceAttribution.compute(trades)
-        stock_005930 = next(s for s in result.by_stock if s.key == "005930")
+        by_key = {s.key: s for s in result.by_stock}
+        stock_005930 = by_key["005930"]
         assert stock_005930.pnl == 150000
         assert stock_005930.trade_count == 2
 
@@ -236,109 +271,76 @@ class TestPerformanceAttribution:
 # ── RiskManager integration with Aggregator ──────────────────
 
 
+# Agent state for risk_manager_node; risk_state hands each test a deep copy
+_BASE_RISK_STATE = {
+    "messages": [],
+    "user_id": "",  # filled per test
+    "session_id": "",
+    "market_regime": {"classification": "bull", "confidence": 0.8, "indicators": {}, "timestamp": ""},
+    "watchlist": ["005930"],
+    "strategy_candidates": [{
+        "stock_code": "005930",
+        "composite_score": 80,
+        "current_price": 70000,
+        "backtest_metrics": {
+            "total_return": 0.15, "sharpe_ratio": 1.2,
+            "max_drawdown": -0.08, "win_rate": 55,
+            "profit_factor": 1.5, "total_trades": 30,
+        },
+        "validation_scores": {},
+        "parameters": {},
+        "strategy_name": "sma_crossover",
+    }],
+    "optimization_status": "",
+    "risk_assessment": None,
+    "pending_orders": [],
+    "executed_orders": [],
+    "portfolio_snapshot": {"total_balance": 10_000_000},
+    "alerts": [],
+    "current_agent": "",
+    "iteration_count": 0,
+    "should_continue": True,
+    "error_state": None,
+    "pending_approval": False,
+    "pending_trades": [],
+    "approval_status": None,
+    "approval_threshold": 5_000_000,
+    "hitl_enabled": False,
+    "memory_context": "",
+    "execution_config": None,
+    "slippage_report": [],
+}
+
+
+@pytest.fixture
+def risk_state():
+    state = copy.deepcopy(_BASE_RISK_STATE)
+    state["user_id"] = str(uuid.uuid4())
+    state["session_id"] = str(uuid.uuid4())
+    return state
+
+
 class TestRiskManagerAggregation:
     @pytest.mark.asyncio
-    async def test_risk_manager_with_existing_positions(self):
+    async def test_risk_manager_with_existing_positions(self, risk_state):
         """Verify risk_manager_node picks up cross-strategy exposure warnings."""
-        from app.agents.nodes.risk_manager import risk_manager_node
-        import uuid
-
-        state = {
-            "messages": [],
-            "user_id": str(uuid.uuid4()),
-            "session_id": str(uuid.uuid4()),
-            "market_regime": {"classification": "bull", "confidence": 0.8, "indicators": {}, "timestamp": ""},
-            "watchlist": ["005930"],
-            "strategy_candidates": [{
+        # Existing positions with high concentration
+        risk_state["existing_positions"] = [
+            {
+                "strategy_id": "strat-1",
+                "strategy_name": "SMA",
                 "stock_code": "005930",
-                "composite_score": 80,
-                "current_price": 70000,
-                "backtest_metrics": {
-                    "total_return": 0.15, "sharpe_ratio": 1.2,
-                    "max_drawdown": -0.08, "win_rate": 55,
-                    "profit_factor": 1.5, "total_trades": 30,
-                },
-                "validation_scores": {},
-                "parameters": {},
-                "strategy_name": "sma_crossover",
-            }],
-            "optimization_status": "",
-            "risk_assessment": None,
-            "pending_orders": [],
-            "executed_orders": [],
-            "portfolio_snapshot": {"total_balance": 10_000_000},
-            "alerts": [],
-            "current_agent": "",
-            "iteration_count": 0,
-            "should_continue": True,
-            "error_state": None,
-            "pending_approval": False,
-            "pending_trades": [],
-            "approval_status": None,
-            "approval_threshold": 5_000_000,
-            "hitl_enabled": False,
-            "memory_context": "",
-            "execution_config": None,
-            "slippage_report": [],
-            # Existing positions with high concentration
-            "existing_positions": [
-                {
-                    "strategy_id": "strat-1",
-                    "strategy_name": "SMA",
-                    "stock_code": "005930",
-                    "quantity": 100,
-                    "value": 9_000_000,
-                },
-            ],
-        }
-        result = await risk_manager_node(state)
+                "quantity": 100,
+                "value": 9_000_000,
+            },
+        ]
+        result = await risk_manager_node(risk_state)
         # Should have a concentration warning since HHI=10000
         assert any("concentration" in w.lower() or "HHI" in w for w in result["risk_assessment"]["warnings"])
 
     @pytest.mark.asyncio
-    async def test_risk_manager_without_existing_positions(self):
+    async def test_risk_manager_without_existing_positions(self, risk_state):
         """Without existing positions, aggregation is skipped cleanly."""
-        from app.agents.nodes.risk_manager import risk_manager_node
-        import uuid
-
-        state = {
-            "messages": [],
-            "user_id": str(uuid.uuid4()),
-            "session_id": str(uuid.uuid4()),
-            "market_regime": {"classification": "bull", "confidence": 0.8, "indicators": {}, "timestamp": ""},
-            "watchlist": ["005930"],
-            "strategy_candidates": [{
-                "stock_code": "005930",
-                "composite_score": 80,
-                "current_price": 70000,
-                "backtest_metrics": {
-                    "total_return": 0.15, "sharpe_ratio": 1.2,
-                    "max_drawdown": -0.08, "win_rate": 55,
-                    "profit_factor": 1.5, "total_trades": 30,
-                },
-                "validation_scores": {},
-                "parameters": {},
-                "strategy_name": "sma_crossover",
-            }],
-            "optimization_status": "",
-            "risk_assessment": None,
-            "pending_orders": [],
-            "executed_orders": [],
-            "portfolio_snapshot": {"total_balance": 10_000_000},
-            "alerts": [],
-            "current_agent": "",
-            "iteration_count": 0,
-            "should_continue": True,
-            "error_state": None,
-            "pending_approval": False,
-            "pending_trades": [],
-            "approval_status": None,
-            "approval_threshold": 5_000_000,
-            "hitl_enabled": False,
-            "memory_context": "",
-            "execution_config": None,
-            "slippage_report": [],
-        }
-        result = await risk_manager_node(state)
+        result = await risk_manager_node(risk_state)
         assert "approved_trades" in result["risk_assessment"]
         assert "005930" in result["risk_assessment"]["approved_trades"]
@@ -1,27 +1,51 @@
 """Tests for Rankings API endpoints."""
 
+import asyncio
 import uuid
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.api.v1.rankings import (
+    _interest_cache,
+    clear_interest_cache,
+    get_interest_stocks,
+    get_price_rankings,
+    get_rankings_catalog,
+    get_trending_stocks,
+    get_volume_rankings,
+)
 
-@pytest.fixture
+
+def _returning(value):
+    """Plain coroutine function standing in for an awaited call that succeeds."""
+    async def _call(*args, **kwargs):
+        return value
+    return _call
+
+
+def _raising(exc):
+    """Plain coroutine function standing in for an awaited call that fails."""
+    async def _call(*args, **kwargs):
+        raise exc
+    return _call
+
+
+# Mocks are built once per module; _reset_mocks clears call history between tests
+@pytest.fixture(scope="module")
 def test_user():
     user = MagicMock()
     user.id = uuid.uuid4()
     return user
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_db():
-    db = MagicMock()
-    db.execute = AsyncMock()
-    db.commit = AsyncMock()
-    return db
+    # Only handed to the patched get_kis_client; never awaited
+    return MagicMock()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_kis():
     kis = MagicMock()
     kis.get_price_ranking = AsyncMock(return_value=[
@@ -37,11 +61,17 @@ def mock_kis():
     return kis
 
 
+@pytest.fixture(autouse=True)
+def _reset_mocks(mock_db, mock_kis):
+    yield
+    mock_db.reset_mock()
+    mock_kis.reset_mock()
+    clear_interest_cache()
+
+
 class TestRankingsCatalog:
     @pytest.mark.asyncio
     async def test_returns_catalog(self, test_user):
-        from app.api.v1.rankings import get_rankings_catalog
-
         result = await get_rankings_catalog(user=test_user)
         assert "rankings" in result
         assert len(result["rankings"]) == 5
@@ -54,8 +84,6 @@ class TestRankingsCatalog:
 
     @pytest.mark.asyncio
     async def test_includes_theme_count(self, test_user):
-        from app.api.v1.rankings import get_rankings_catalog
-
         result = await get_rankings_catalog(user=test_user)
         assert "theme_count" in result
         assert result["theme_count"] >= 10
@@ -64,9 +92,7 @@ class TestRankingsCatalog:
 class TestPriceRankings:
     @pytest.mark.asyncio
     async def test_returns_data_from_kis(self, test_user, mock_db, mock_kis):
-        from app.api.v1.rankings import get_price_rankings
-
-        with patch("app.api.v1.rankings.get_kis_client", AsyncMock(return_value=mock_kis)):
+        with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
             result = await get_price_rankings(direction="up", limit=30, user=test_user, db=mock_db)
         assert len(result) == 2
         assert result[0].stock_code == "005930"
@@ -74,17 +100,13 @@ class TestPriceRankings:
 
     @pytest.mark.asyncio
     async def test_direction_down(self, test_user, mock_db, mock_kis):
-        from app.api.v1.rankings import get_price_rankings
-
-        with patch("app.api.v1.rankings.get_kis_client", AsyncMock(return_value=mock_kis)):
+        with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
             result = await get_price_rankings(direction="down", limit=10, user=test_user, db=mock_db)
         assert isinstance(result, list)
 
     @pytest.mark.asyncio
     async def test_returns_empty_on_error(self, test_user, mock_db):
-        from app.api.v1.rankings import get_price_rankings
-
-        with patch("app.api.v1.rankings.get_kis_client", AsyncMock(side_effect=Exception("no creds"))):
+        with patch("app.api.v1.rankings.get_kis_client", _raising(Exception("no creds"))):
             result = await get_price_rankings(direction="up", limit=30, user=test_user, db=mock_db)
         assert result == []
 
@@ -92,18 +114,14 @@ class TestPriceRankings:
 class TestVolumeRankings:
     @pytest.mark.asyncio
     async def test_returns_data_from_kis(self, test_user, mock_db, mock_kis):
-        from app.api.v1.rankings import get_volume_rankings
-
-        with patch("app.api.v1.rankings.get_kis_client", AsyncMock(return_value=mock_kis)):
+        with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
             result = await get_volume_rankings(limit=30, user=test_user, db=mock_db)
         assert len(result) == 1
         assert result[0].stock_code == "005930"
 
     @pytest.mark.asyncio
     async def test_returns_empty_on_error(self, test_user, mock_db):
-        from app.api.v1.rankings import get_volume_rankings
-
-        with patch("app.api.v1.rankings.get_kis_client", AsyncMock(side_effect=Exception("fail"))):
+        with patch("app.api.v1.rankings.get_kis_client", _raising(Exception("fail"))):
             result = await get_volume_rankings(limit=30, user=test_user, db=mock_db)
         assert result == []
 
@@ -111,9 +129,7 @@ class TestVolumeRankings:
 class TestInterestStocks:
     @pytest.mark.asyncio
     async def test_returns_scored_list(self, test_user, mock_db, mock_kis):
-        from app.api.v1.rankings import get_interest_stocks
-
-        with patch("app.api.v1.rankings.get_kis_client", AsyncMock(return_value=mock_kis)):
+        with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
             result = await get_interest_stocks(limit=20, user=test_user, db=mock_db)
         assert isinstance(result, list)
         assert len(result) >= 1
@@ -124,23 +140,75 @@ class TestInterestStocks:
 
     @pytest.mark.asyncio
     async def test_returns_empty_on_error(self, test_user, mock_db):
-        from app.api.v1.rankings import get_interest_stocks
-
-        with patch("app.api.v1.rankings.get_kis_client", AsyncMock(side_effect=Exception("fail"))):
+        with patch("app.api.v1.rankings.get_kis_client", _raising(Exception("fail"))):
             result = await get_interest_stocks(limit=20, user=test_user, db=mock_db)
         assert result == []
 
+    @pytest.mark.asyncio
+    async def test_repeat_request_served_from_cache(self, test_user, mock_db, mock_kis):
+        with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
+            first = await get_interest_stocks(limit=20, user=test_user, db=mock_db)
+            second = await get_interest_stocks(limit=20, user=test_user, db=mock_db)
+        assert second == first
+        assert mock_kis.get_price_ranking.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_source_treated_as_empty(self, test_user, mock_db, mock_kis):
+        mock_kis.get_volume_ranking.side_effect = Exception("volume down")
+        try:
+            with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
+                result = await get_interest_stocks(limit=20, user=test_user, db=mock_db)
+        finally:
+            mock_kis.get_volume_ranking.side_effect = None
+        assert [r.stock_code for r in result][:1] == ["005930"]
+        assert mock_kis.get_price_ranking.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_degraded_result_not_cached(self, test_user, mock_db, mock_kis):
+        mock_kis.get_volume_ranking.side_effect = [Exception("volume down"), mock_kis.get_volume_ranking.return_value]
+        try:
+            with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
+                await get_interest_stocks(limit=20, user=test_user, db=mock_db)
+                await get_interest_stocks(limit=20, user=test_user, db=mock_db)
+        finally:
+            mock_kis.get_volume_ranking.side_effect = None
+        assert mock_kis.get_volume_ranking.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded(self, test_user, mock_db, mock_kis):
+        with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)), \
+                patch("app.api.v1.rankings._INTEREST_CACHE_MAX_SIZE", 2):
+            for limit in (1, 2, 3):
+                await get_interest_stocks(limit=limit, user=test_user, db=mock_db)
+        assert list(_interest_cache) == [(test_user.id, 2), (test_user.id, 3)]
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_evicted(self, test_user, mock_db, mock_kis):
+        with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)), \
+                patch("app.api.v1.rankings._INTEREST_TTL", 0.0):
+            for limit in (1, 2, 3):
+                await get_interest_stocks(limit=limit, user=test_user, db=mock_db)
+        assert list(_interest_cache) == [(test_user.id, 3)]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_source_treated_as_empty(self, test_user, mock_db, mock_kis):
+        mock_kis.get_volume_ranking.side_effect = asyncio.CancelledError()
+        try:
+            with patch("app.api.v1.rankings.get_kis_client", _returning(mock_kis)):
+                result = await get_interest_stocks(limit=20, user=test_user, db=mock_db)
+        finally:
+            mock_kis.get_volume_ranking.side_effect = None
+        assert [r.stock_code for r in result][:1] == ["005930"]
+
 
 class TestTrendingStocks:
     @pytest.mark.asyncio
     async def test_returns_trending_data(self, test_user):
-        from app.api.v1.rankings import get_trending_stocks
-
         mock_data = [
             {"rank": 1, "stock_name": "삼성전자", "stock_code": "005930",
              "search_ratio": 12.5, "price": 78000, "change_pct": 2.63},
         ]
-        with patch("app.services.trending_stocks.fetch_naver_trending", AsyncMock(return_value=mock_data)):
+        with patch("app.services.trending_stocks.fetch_naver_trending", _returning(mock_data)):
             result = await get_trending_stocks(limit=20, user=test_user)
         assert len(result) == 1
         assert result[0].stock_name == "삼성전자"
@@ -148,9 +216,7 @@ class TestTrendingStocks:
 
     @pytest.mark.asyncio
     async def test_returns_empty_on_error(self, test_user):
-        from app.api.v1.rankings import get_trending_stocks
-
-        with patch("app.services.trending_stocks.fetch_naver_trending", AsyncMock(side_effect=Exception("fail"))):
+        with patch("app.services.trending_stocks.fetch_naver_trending", _raising(Exception("fail"))):
             result = await get_trending_stocks(limit=20, user=test_user)
         assert result == []
 
@@ -158,8 +224,6 @@ class TestTrendingStocks:
 class TestRankingsCatalogIncludesTrending:
     @pytest.mark.asyncio
     async def test_catalog_has_trending(self, test_user):
-        from app.api.v1.rankings import get_rankings_catalog
-
         result = await get_rankings_catalog(user=test_user)
         types = {r["type"] for r in result["rankings"]}
         assert "trending" in types